@@ -0,0 +1,2 @@
+# Benchmarks are run as modules from the scriptoria_game directory,
+# e.g. python -m benchmarks.bench_renderers
\ No newline at end of file
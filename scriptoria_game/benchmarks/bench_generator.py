@@ -0,0 +1,51 @@
+"""Measure procedural level generation and the pause when advancing in endless mode
+
+Run from the scriptoria_game directory (no display needed):
+    python -m benchmarks.bench_generator [--levels N] [--seed S]
+"""
+import argparse
+import time
+from game.generator import generate_levels
+from game.level_manager import LevelManager
+from game.session import GameSession
+from game.validator import check_level, level_spec
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--levels", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    levels = generate_levels(args.seed)
+    start = time.perf_counter()
+    generated = [next(levels) for _ in range(args.levels)]
+    elapsed = time.perf_counter() - start
+    invalid = sum(1 for level in generated if check_level(level_spec(level)))
+    print(f"generated {args.levels} levels: {args.levels / elapsed:,.0f} levels/s, {invalid} invalid")
+
+    # Advancing with the next level prefetched vs. generating and parsing it on demand
+    session = GameSession(endless_seed=args.seed)
+    first = len(session.level_manager.get_all_levels())
+    pauses = []
+    for index in range(first, first + 100):
+        # Give the worker thread the time a player would spend on the level
+        time.sleep(0.001)
+        start = time.perf_counter()
+        session.start_level(index)
+        pauses.append(time.perf_counter() - start)
+    session.close()
+
+    level_manager = LevelManager()
+    levels = generate_levels(args.seed)
+    cold = []
+    for _ in range(100):
+        start = time.perf_counter()
+        index = level_manager.add_level(next(levels))
+        level_manager.create_map(index)
+        cold.append(time.perf_counter() - start)
+
+    print(f"next level, prefetched: {max(pauses) * 1000:.3f} ms worst, {sum(pauses) / len(pauses) * 1000:.3f} ms mean")
+    print(f"next level, on demand:  {max(cold) * 1000:.3f} ms worst, {sum(cold) / len(cold) * 1000:.3f} ms mean")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Time LevelManager startup (with and without a compiled cache), map creation and per-session map memory
+
+Run from the scriptoria_game directory (no display needed):
+    python -m benchmarks.bench_level_pack [--levels N ...]
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from game.level_manager import LevelManager, BUILTIN_PACK
+from game.level_pack import write_pack
+from game.compiled_pack import cache_path
+from benchmarks.bench_validator import make_levels
+
+def bench(path):
+    """Seconds to open a pack cold (compiling its cache) and warm, then build the first map twice"""
+    cache = cache_path(path)
+    if os.path.exists(cache):
+        os.remove(cache)
+    start = time.perf_counter()
+    LevelManager(path)
+    cold = time.perf_counter()
+    level_manager = LevelManager(path)
+    warm = time.perf_counter()
+    level_manager.create_map(0)
+    first = time.perf_counter()
+    level_manager.create_map(0)
+    again = time.perf_counter()
+    return len(level_manager.get_all_levels()), cold - start, warm - cold, first - warm, again - first
+
+def session_memory(level_manager, sessions=1000):
+    """Bytes allocated per map created by create_map, before and after one edit"""
+    level_manager.create_map(0)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    maps = [level_manager.create_map(0) for _ in range(sessions)]
+    fresh = tracemalloc.get_traced_memory()[0]
+    for grid, _, _ in maps:
+        grid.set_original(1, 1, 'a')
+    edited = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (fresh - before) / sessions, (edited - before) / sessions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--levels", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+
+    paths = [BUILTIN_PACK]
+    with tempfile.TemporaryDirectory() as directory:
+        for count in args.levels:
+            path = os.path.join(directory, f"generated_{count}.pack")
+            write_pack(path, make_levels(count, 16, 40))
+            paths.append(path)
+        for path in paths:
+            count, cold, warm, first, again = bench(path)
+            print(f"{count:>6} levels: cold open {cold * 1000:.2f} ms, warm open {warm * 1000:.2f} ms, "
+                  f"first map {first * 1000:.3f} ms, restart {again * 1000:.3f} ms")
+        fresh, edited = session_memory(LevelManager(paths[-1]))
+        print(f"map memory per session: {fresh:.0f} bytes fresh, {edited:.0f} bytes after one edit")
+
+if __name__ == "__main__":
+    main()
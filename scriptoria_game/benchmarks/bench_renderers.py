@@ -0,0 +1,71 @@
+"""Compare frame times of the text and atlas map renderers on full-screen maps
+
+Run from the scriptoria_game directory (needs a display):
+    python -m benchmarks.bench_renderers [--frames N] [--rows R] [--cols C]
+"""
+import argparse
+import random
+import string
+import time
+import tkinter as tk
+from constants import COLORS
+from gui.map_renderer import RENDERERS, Image, create_renderer
+
+CELL_SIZE = 20
+
+def make_frames(count, rows, cols, seed=0):
+    """Build count full-screen frames of random (character, color) cells"""
+    rng = random.Random(seed)
+    chars = string.ascii_letters + string.digits + "#  "
+    colors = list(COLORS.values())
+    return [
+        [[(rng.choice(chars), rng.choice(colors)) for _ in range(cols)] for _ in range(rows)]
+        for _ in range(count)
+    ]
+
+def bench(root, name, frames):
+    """Paint every frame with one renderer and return the mean seconds per frame"""
+    canvas = tk.Canvas(root, bg=COLORS["bg"], highlightthickness=0,
+                       width=len(frames[0][0]) * CELL_SIZE, height=len(frames[0]) * CELL_SIZE)
+    canvas.pack()
+    renderer = create_renderer(name, canvas, CELL_SIZE, CELL_SIZE)
+
+    # Warm-up frame builds the item pool (and the glyph atlas)
+    for frame in frames[:1]:
+        for y, row in enumerate(frame):
+            for x, (cell, color) in enumerate(row):
+                renderer.draw((y, x), cell, color)
+    root.update()
+
+    start = time.perf_counter()
+    for frame in frames:
+        for y, row in enumerate(frame):
+            for x, (cell, color) in enumerate(row):
+                renderer.draw((y, x), cell, color)
+        # Force Tk to actually redraw the canvas
+        root.update()
+    elapsed = time.perf_counter() - start
+
+    canvas.destroy()
+    return elapsed / len(frames)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--rows", type=int, default=30)
+    parser.add_argument("--cols", type=int, default=40)
+    args = parser.parse_args()
+
+    root = tk.Tk()
+    frames = make_frames(args.frames, args.rows, args.cols)
+    names = sorted(RENDERERS) if Image is not None else ["text"]
+    print(f"{args.rows}x{args.cols} cells, {args.frames} frames")
+    for name in names:
+        per_frame = bench(root, name, frames)
+        print(f"{name:>6}: {per_frame * 1000:.2f} ms/frame")
+    if Image is None:
+        print("  atlas: skipped (Pillow is not installed)")
+    root.destroy()
+
+if __name__ == "__main__":
+    main()
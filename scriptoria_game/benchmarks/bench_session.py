@@ -0,0 +1,58 @@
+"""Measure headless keystroke throughput of GameSession for every level
+
+Run from the scriptoria_game directory (no display needed):
+    python -m benchmarks.bench_session [--keys N] [--seed S]
+"""
+import argparse
+import random
+import time
+from game.session import GameSession, ESCAPE
+
+# Keys a player would use in normal mode, weighted towards plain movement
+NORMAL_KEYS = "hjklhjklhjkl" + "wbe0$x" + "23" + "u\x12"
+
+def make_keys(count, seed=0):
+    """A reproducible stream of normal-mode keys with short insert sessions mixed in"""
+    rng = random.Random(seed)
+    keys = []
+    while len(keys) < count:
+        if rng.random() < 0.02:
+            keys.append('i')
+            keys.extend(rng.choice("abcdefghijklmnopqrstuvwxyz ") for _ in range(rng.randint(1, 8)))
+            keys.append(ESCAPE)
+        else:
+            keys.append(rng.choice(NORMAL_KEYS))
+    return keys[:count]
+
+def bench(session, level_index, keys):
+    """Play keys on a level, restarting it whenever it is completed; return keys per second"""
+    session.start_level(level_index)
+    start = time.perf_counter()
+    done = 0
+    restarts = 0
+    while done < len(keys):
+        done += session.step_many(keys[done:])
+        # Messages would pile up without a frontend draining them
+        session.take_messages()
+        session.take_changed_cells()
+        if session.level_completed:
+            session.start_level(level_index)
+            restarts += 1
+    elapsed = time.perf_counter() - start
+    return len(keys) / elapsed, restarts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    session = GameSession()
+    keys = make_keys(args.keys, args.seed)
+    print(f"{args.keys} keys per level")
+    for level_index, level in enumerate(session.level_manager.get_all_levels()):
+        rate, restarts = bench(session, level_index, keys)
+        print(f"level {level_index + 1} ({level.name}): {rate:,.0f} keys/s, {restarts} completions")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Measure the time from import to first paint of the Tk game
+
+Each run is a fresh interpreter, split into importing the game modules,
+building the window and GameManager, and reaching the first idle of mainloop
+(by which point Tk has drawn the main menu). --eager also builds the level
+select and game screens up front, as GameManager did before screens were lazy.
+
+Run from the scriptoria_game directory (needs a display):
+    python -m benchmarks.bench_startup [--runs N] [--eager]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+PHASES = ("import", "construct", "first_idle")
+
+def run_once(eager):
+    """Start the game once in this process and print the phase times as JSON"""
+    start = time.perf_counter()
+    import tkinter as tk
+    from main import GameManager
+    imported = time.perf_counter()
+
+    root = tk.Tk()
+    game = GameManager(root)
+    if eager:
+        game.level_select
+        game.game_screen
+    constructed = time.perf_counter()
+
+    times = {}
+
+    def idle():
+        times["idle"] = time.perf_counter()
+        root.quit()
+
+    root.after_idle(idle)
+    root.mainloop()
+    print(json.dumps({
+        "import": imported - start,
+        "construct": constructed - imported,
+        "first_idle": times["idle"] - constructed,
+    }))
+    game.close()
+    root.destroy()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--eager", action="store_true",
+                        help="build every screen at startup instead of on first use")
+    parser.add_argument("--once", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.once:
+        run_once(args.eager)
+        return
+
+    command = [sys.executable, "-m", "benchmarks.bench_startup", "--once"]
+    if args.eager:
+        command.append("--eager")
+    results = []
+    for _ in range(args.runs):
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        results.append(json.loads(output.splitlines()[-1]))
+
+    print(f"{args.runs} runs, {'eager' if args.eager else 'lazy'} screens (median ms)")
+    total = 0.0
+    for phase in PHASES:
+        median = statistics.median(result[phase] for result in results)
+        total += median
+        print(f"{phase:>10}: {median * 1000:.1f}")
+    print(f"{'total':>10}: {total * 1000:.1f}")
+
+if __name__ == "__main__":
+    main()
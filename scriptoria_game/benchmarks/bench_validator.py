@@ -0,0 +1,45 @@
+"""Time the level validator on many generated levels with 1..N worker processes
+
+Run from the scriptoria_game directory (no display needed):
+    python -m benchmarks.bench_validator [--levels N] [--rows R] [--cols C]
+"""
+import argparse
+import os
+import random
+import time
+from models.level import Level
+from game.validator import validate_levels
+
+def make_levels(count, rows, cols, seed=0):
+    """Random walled maps with a start, a portal, scattered walls and runes"""
+    rng = random.Random(seed)
+    levels = []
+    for i in range(count):
+        grid = [['#'] * cols] + [['#'] + [' '] * (cols - 2) + ['#'] for _ in range(rows - 2)] + [['#'] * cols]
+        for _ in range(rows * cols // 8):
+            grid[rng.randrange(1, rows - 1)][rng.randrange(1, cols - 1)] = rng.choice("#X")
+        grid[1][1] = 'P'
+        grid[rows - 2][cols - 2] = 'O'
+        levels.append(Level(f"Generated {i + 1}", "", "", "", [''.join(row) for row in grid],
+                            goals=("runes", "portal")))
+    return levels
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--levels", type=int, default=10000)
+    parser.add_argument("--rows", type=int, default=16)
+    parser.add_argument("--cols", type=int, default=40)
+    args = parser.parse_args()
+
+    levels = make_levels(args.levels, args.rows, args.cols)
+    cpus = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, cpus} & set(range(1, cpus + 1)))
+    print(f"{args.levels} levels of {args.rows}x{args.cols}, {cpus} CPUs")
+    for workers in worker_counts:
+        start = time.perf_counter()
+        failed = sum(1 for _, failures in validate_levels(levels, workers) if failures)
+        elapsed = time.perf_counter() - start
+        print(f"{workers:>3} workers: {elapsed:.2f} s ({args.levels / elapsed:,.0f} levels/s), {failed} failed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Measure VecEnv throughput in environment steps per millisecond
+
+Run from the scriptoria_game directory (needs NumPy):
+    python -m benchmarks.bench_vec_env [--envs N] [--steps S] [--seed S]
+"""
+import argparse
+import time
+import numpy as np
+from game.level_manager import LevelManager
+from game.vec_env import VecEnv, ACTION_KEYS
+
+def bench(env, actions):
+    """Step env through a (steps, envs) array of actions; return env steps per millisecond"""
+    env.reset()
+    start = time.perf_counter()
+    for batch in actions:
+        env.step(batch)
+    elapsed = time.perf_counter() - start
+    return actions.size / (elapsed * 1000)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--envs", type=int, default=4096)
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    actions = rng.integers(0, len(ACTION_KEYS), size=(args.steps, args.envs))
+    level_manager = LevelManager()
+    print(f"{args.envs} envs, {args.steps} steps")
+    for level_index, level in enumerate(level_manager.get_all_levels()):
+        if "word" in level.goals:
+            print(f"level {level_index + 1} ({level.name}): skipped (typing goal)")
+            continue
+        env = VecEnv(level_index, args.envs, level_manager)
+        rate = bench(env, actions)
+        print(f"level {level_index + 1} ({level.name}): {rate:,.0f} env steps/ms")
+
+if __name__ == "__main__":
+    main()
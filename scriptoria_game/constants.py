@@ -12,6 +12,15 @@ class GameState(Enum):
     PAUSED = 4
     COMPLETED = 5
 
+class TileClass(Enum):
+    EMPTY = 0
+    WALL = 1
+    PORTAL = 2
+    RUNE = 3
+    WORD = 4
+    GEM = 5
+    TEXT = 6
+
 # Color definitions
 COLORS = {
     "bg": "black",
@@ -27,6 +36,17 @@ COLORS = {
     "mode": "yellow",
 }
 
+# Color key for each tile class
+TILE_COLORS = {
+    TileClass.EMPTY: "bg",
+    TileClass.WALL: "wall",
+    TileClass.PORTAL: "portal",
+    TileClass.RUNE: "rune",
+    TileClass.WORD: "word",
+    TileClass.GEM: "gem",
+    TileClass.TEXT: "text",
+}
+
 # Font configurations
 FONT_TYPES = {
     "title": ("Courier", 16, "bold"),
@@ -34,4 +54,17 @@ FONT_TYPES = {
     "map": ("Courier", 14, "bold"),
     "menu": ("Courier", 18, "bold"),
     "large_title": ("Courier", 28, "bold"),
+    "small": ("Courier", 10, "normal"),
 }
+
+# Message log sizes
+MESSAGE_LOG_SIZE = 100
+VISIBLE_MESSAGES = 3
+
+# Map viewport size in cells (until the canvas reports its real size)
+VIEW_ROWS = 15
+VIEW_COLS = 38
+VIEW_MARGIN = 3
+
+# Seconds between refreshes of the latency overlay
+LATENCY_OVERLAY_INTERVAL = 0.25
\ No newline at end of file
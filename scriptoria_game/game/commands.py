@@ -0,0 +1,186 @@
+from constants import TileClass
+
+# Motions: (grid, y, x, count, current_level) -> new (y, x)
+# A counted motion is computed in one step; the caller moves the player once.
+
+def motion_left(grid, y, x, count, current_level):
+    """h: move left, stopping in front of a wall"""
+    row = grid.row(y)
+    wall = row.rfind('#', max(0, x - count), x)
+    return y, max(0, x - count, wall + 1)
+
+def motion_right(grid, y, x, count, current_level):
+    """l: move right, stopping in front of a wall"""
+    row = grid.row(y)
+    target = min(grid.width - 1, x + count)
+    wall = row.find('#', x + 1, target + 1)
+    return y, target if wall == -1 else wall - 1
+
+def motion_down(grid, y, x, count, current_level):
+    """j: move down, stopping in front of a wall"""
+    target = y
+    while target < min(grid.height - 1, y + count) and grid.get(target + 1, x) != '#':
+        target += 1
+    return target, x
+
+def motion_up(grid, y, x, count, current_level):
+    """k: move up, stopping in front of a wall"""
+    target = y
+    while target > max(0, y - count) and grid.get(target - 1, x) != '#':
+        target -= 1
+    return target, x
+
+def motion_word_forward(grid, y, x, count, current_level):
+    """w: jump to the start of the next word"""
+    if current_level < 3:  # Only active in level 4+
+        return y, x
+    words = grid.word_index()
+    for _ in range(count):
+        target = words.next_start(y, x)
+        if target is None:
+            break
+        y, x = target
+    return y, x
+
+def motion_word_backward(grid, y, x, count, current_level):
+    """b: jump back to the end of the previous word"""
+    if current_level < 4:  # Only active in level 5+
+        return y, x
+    words = grid.word_index()
+    for _ in range(count):
+        target = words.prev_end(y, x)
+        if target is None:
+            break
+        y, x = target
+    return y, x
+
+def motion_word_end(grid, y, x, count, current_level):
+    """e: jump to the end of the next word"""
+    if current_level < 3:  # Only active in level 4+, like w
+        return y, x
+    words = grid.word_index()
+    for _ in range(count):
+        target = words.next_end(y, x)
+        if target is None:
+            break
+        y, x = target
+    return y, x
+
+def motion_line_start(grid, y, x, count, current_level):
+    """0: jump to the first cell after the wall on the left"""
+    return y, grid.row(y).rfind('#', 0, x) + 1
+
+def motion_line_end(grid, y, x, count, current_level):
+    """$: jump to the last cell before the wall on the right"""
+    wall = grid.row(y).find('#', x + 1)
+    return y, grid.width - 1 if wall == -1 else wall - 1
+
+def motion_top(grid, y, x, count, current_level):
+    """gg: jump up to the wall, or to row [count] when a count is given"""
+    if count is not None:
+        return min(grid.height - 1, count - 1), x
+    return motion_up(grid, y, x, grid.height, current_level)
+
+def motion_bottom(grid, y, x, count, current_level):
+    """G: jump down to the wall, or to row [count] when a count is given"""
+    if count is not None:
+        return min(grid.height - 1, count - 1), x
+    return motion_down(grid, y, x, grid.height, current_level)
+
+# Operators: (game_logic, grid, objectives, y, x, count) -> (y, x, level_completed, message)
+
+def operator_delete(game_logic, grid, objectives, y, x, count):
+    """x: remove the runes in the count cells starting under the cursor"""
+    removed = 0
+    for test_x in range(x, min(grid.width, x + count)):
+        # The player glyph covers the cursor cell, so look at the tile layer
+        if grid.tile(y, test_x) is TileClass.RUNE:
+            game_logic.set_cell(grid, objectives, y, test_x, ' ')
+            if test_x == x:
+                grid.set(y, x, 'P')
+            removed += 1
+    if not removed:
+        return y, x, False, None
+    message = "You removed a rune!" if removed == 1 else f"You removed {removed} runes!"
+    return y, x, objectives.is_complete(), message
+
+def operator_undo(game_logic, grid, objectives, y, x, count):
+    """u: undo the last count edit commands"""
+    return apply_history(game_logic, grid, objectives, y, x, count, undo=True)
+
+def operator_redo(game_logic, grid, objectives, y, x, count):
+    """Ctrl-R: redo the last count undone commands"""
+    return apply_history(game_logic, grid, objectives, y, x, count, undo=False)
+
+def apply_history(game_logic, grid, objectives, y, x, count, undo):
+    """Shared body of undo/redo: replay journal groups, then put the cursor on the change"""
+    applied = 0
+    target = (y, x)
+    for _ in range(count):
+        group = game_logic.journal.undo() if undo else game_logic.journal.redo()
+        if group is None:
+            break
+        target = game_logic.apply_edits(grid, objectives, (y, x), group, undo)
+        applied += 1
+    if not applied:
+        return y, x, False, "Already at oldest change" if undo else "Already at newest change"
+    action = "Undid" if undo else "Redid"
+    # Undoing only ever takes progress back; a redo can finish the level again
+    level_completed = not undo and objectives.is_complete()
+    return target[0], target[1], level_completed, f"{action} {applied} change{'s' if applied > 1 else ''}"
+
+MOTIONS = {
+    'h': motion_left,
+    'j': motion_down,
+    'k': motion_up,
+    'l': motion_right,
+    'w': motion_word_forward,
+    'b': motion_word_backward,
+    'e': motion_word_end,
+    '0': motion_line_start,
+    '$': motion_line_end,
+    'gg': motion_top,
+    'G': motion_bottom,
+}
+
+# Motions whose count means "go to this row" rather than "repeat"
+ABSOLUTE_MOTIONS = {'gg', 'G'}
+
+OPERATORS = {
+    'x': operator_delete,
+    'u': operator_undo,
+    '\x12': operator_redo,  # Ctrl-R
+}
+
+# Keys that start a two-key command
+PREFIXES = {'g'}
+
+class CommandParser:
+    """Accumulates normal-mode keys into ([count], command) pairs, vim style"""
+    def __init__(self):
+        self.count = ''
+        self.prefix = ''
+
+    def reset(self):
+        """Drop any half-typed count or prefix"""
+        self.count = ''
+        self.prefix = ''
+
+    def feed(self, key):
+        """Feed one key; return (command, count) once complete, else None
+
+        count is None when no count was typed. An empty key (a modifier
+        press) is ignored and keeps any pending count or prefix.
+        """
+        if not key:
+            return None
+        if not self.prefix and key.isdigit() and (key != '0' or self.count):
+            self.count += key
+            return None
+        command = self.prefix + key
+        if command in PREFIXES:
+            self.prefix = command
+            return None
+        count = int(self.count) if self.count else None
+        self.reset()
+        return command, count
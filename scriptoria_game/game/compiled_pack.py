@@ -0,0 +1,156 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+from game.level_pack import LevelPack, level_from_metadata
+
+# A compiled pack sits next to its source as <pack>.cache:
+#   header      - HEADER: stamp of the source it was built from, level count,
+#                 where the metadata table is
+#   map table   - MAP_ENTRY per level: offset of its cells, height, width
+#   metadata    - JSON list of each level's metadata fields
+#   cells       - each map as height * width bytes, rows padded to the width
+CACHE_SUFFIX = ".cache"
+MAGIC = b"SCRPACK\0"
+VERSION = 1
+# magic, version, source mtime_ns, source size, source sha256, level count, metadata offset, metadata length
+HEADER = struct.Struct("<8sIqQ32sIQQ")
+MTIME = struct.Struct("<q")
+MTIME_OFFSET = struct.calcsize("<8sI")
+# cells offset, height, width
+MAP_ENTRY = struct.Struct("<QHH")
+# Largest height or width a map entry can hold
+MAX_MAP_SIZE = 0xFFFF
+
+def cache_path(pack_path):
+    """Where the compiled cache of a pack lives"""
+    return pack_path + CACHE_SUFFIX
+
+def file_hash(path):
+    """SHA-256 digest of a file"""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).digest()
+
+def map_problem(rows):
+    """Why map rows cannot be stored as (row, message), or None if they can"""
+    if len(rows) > MAX_MAP_SIZE:
+        return MAX_MAP_SIZE, f"map has {len(rows)} rows, at most {MAX_MAP_SIZE} are supported"
+    for y, row in enumerate(rows):
+        if len(row) > MAX_MAP_SIZE:
+            return y, f"row is {len(row)} cells wide, at most {MAX_MAP_SIZE} are supported"
+        try:
+            row.encode("latin-1")
+        except UnicodeEncodeError as error:
+            return y, f"character {row[error.start]!r} at column {error.start} is not latin-1, which maps are stored as"
+    return None
+
+def compile_pack(pack_path, path=None):
+    """Parse a text pack and write its compiled cache (atomically, via a temp file)
+
+    Raises ValueError naming the level and line of a map that cannot be stored.
+    """
+    path = path or cache_path(pack_path)
+    stat = os.stat(pack_path)
+    digest = file_hash(pack_path)
+    pack = LevelPack(pack_path)
+    metadata = json.dumps([entry[0] for entry in pack.entries]).encode("utf-8")
+
+    table_offset = HEADER.size
+    metadata_offset = table_offset + MAP_ENTRY.size * len(pack)
+    offset = metadata_offset + len(metadata)
+    table = []
+    maps = []
+    for index in range(len(pack)):
+        rows = pack.read_map(index)
+        problem = map_problem(rows)
+        if problem is not None:
+            y, message = problem
+            name = pack.entries[index][0]["name"]
+            raise ValueError(f"{pack_path}: level {name!r}, line {pack.map_line(index) + y}: {message}")
+        width = max((len(row) for row in rows), default=0)
+        cells = ''.join(row.ljust(width) for row in rows).encode("latin-1")
+        table.append(MAP_ENTRY.pack(offset, len(rows), width))
+        maps.append(cells)
+        offset += len(cells)
+
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, stat.st_mtime_ns, stat.st_size, digest,
+                            len(pack), metadata_offset, len(metadata)))
+        f.writelines(table)
+        f.write(metadata)
+        f.writelines(maps)
+    os.replace(temp_path, path)
+
+def cache_is_fresh(pack_path, path):
+    """Check whether a compiled cache matches its source
+
+    A matching mtime and size is trusted; otherwise the source is hashed, and
+    if only the mtime changed (e.g. a touch or a fresh checkout) the cache's
+    stamp is updated instead of rebuilding it.
+    """
+    try:
+        with open(path, "rb") as f:
+            magic, version, mtime_ns, size, digest, _, _, _ = HEADER.unpack(f.read(HEADER.size))
+    except (OSError, struct.error):
+        return False
+    if magic != MAGIC or version != VERSION:
+        return False
+    stat = os.stat(pack_path)
+    if (stat.st_mtime_ns, stat.st_size) == (mtime_ns, size):
+        return True
+    if stat.st_size != size or file_hash(pack_path) != digest:
+        return False
+    with open(path, "r+b") as f:
+        f.seek(MTIME_OFFSET)
+        f.write(MTIME.pack(stat.st_mtime_ns))
+    return True
+
+class CompiledPack:
+    """A compiled level pack read through a read-only memory map
+
+    Only the header and metadata table are decoded when it is opened; a map's
+    cells are sliced out of the mapping (without copying) when it is played.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        _, _, _, _, _, count, metadata_offset, metadata_length = HEADER.unpack_from(self.buffer, 0)
+        self.count = count
+        self.metadata = json.loads(self.buffer[metadata_offset:metadata_offset + metadata_length])
+
+    def read_cells(self, index):
+        """(height, width, cells) of a level, cells being a view into the mapped file"""
+        offset, height, width = MAP_ENTRY.unpack_from(self.buffer, HEADER.size + index * MAP_ENTRY.size)
+        return height, width, memoryview(self.buffer)[offset:offset + height * width]
+
+    def read_map(self, index):
+        """Map rows of a level (padded to the map width)"""
+        height, width, cells = self.read_cells(index)
+        text = bytes(cells).decode("latin-1")
+        return [text[y * width:(y + 1) * width] for y in range(height)]
+
+    def levels(self):
+        """Level objects that read their maps from the mapped file"""
+        return [level_from_metadata(metadata, lambda index=index: self.read_map(index),
+                                    lambda index=index: self.read_cells(index))
+                for index, metadata in enumerate(self.metadata)]
+
+    def __len__(self):
+        return self.count
+
+def open_pack(pack_path):
+    """The compiled form of a pack, (re)building it if needed
+
+    Falls back to reading the text pack when the cache cannot be written,
+    e.g. in a read-only install. A map that cannot be stored raises ValueError.
+    """
+    path = cache_path(pack_path)
+    try:
+        if not cache_is_fresh(pack_path, path):
+            compile_pack(pack_path, path)
+        return CompiledPack(path)
+    except OSError:
+        return LevelPack(pack_path)
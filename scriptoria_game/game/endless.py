@@ -0,0 +1,36 @@
+from concurrent.futures import ThreadPoolExecutor
+from game.generator import generate_levels
+
+class EndlessLevels:
+    """Appends generated practice levels to a LevelManager, keeping the next one ready
+
+    A worker thread generates the following level and parses its map template
+    while the current level is played, so advancing only appends a finished
+    level instead of pausing to build one.
+    """
+    def __init__(self, level_manager, seed=0):
+        self.level_manager = level_manager
+        self.levels = generate_levels(seed, start=len(level_manager.get_all_levels()) + 1)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="level-prefetch")
+        self.pending = None
+        self.prefetch()
+
+    def prefetch(self):
+        """Start building the next level in the background"""
+        self.pending = self.executor.submit(self.build_next)
+
+    def build_next(self):
+        """Generate a level and its template (runs on the worker thread)"""
+        level = next(self.levels)
+        return level, self.level_manager.build_template(level)
+
+    def advance(self):
+        """Add the prefetched level to the level manager; return its index"""
+        level, template = self.pending.result()
+        index = self.level_manager.add_level(level, template)
+        self.prefetch()
+        return index
+
+    def close(self):
+        """Stop the worker thread"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
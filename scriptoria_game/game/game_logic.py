@@ -1,4 +1,7 @@
-from constants import Mode
+from constants import Mode, TileClass
+from game.objectives import count_runes, count_gems
+from game.commands import CommandParser, MOTIONS, ABSOLUTE_MOTIONS, OPERATORS
+from game.undo import UndoJournal
 
 class GameLogic:
     def __init__(self, level_manager):
@@ -8,98 +11,117 @@ class GameLogic:
             Mode.INSERT: "Text creation mode: type to create text, ESC to exit",
             Mode.VISUAL: "Selection mode: move to select, y to copy, d to remove"
         }
+        # Cells (y, x) touched by the handlers since the last redraw
+        self.changed_cells = set()
+        # Pending [count] and prefix keys of the normal-mode command being typed
+        self.commands = CommandParser()
+        # Undo/redo history of map edits for the current level
+        self.journal = UndoJournal()
     
-    def handle_normal_mode(self, key, game_map, original_map, player_position, current_level):
+    def start_level(self):
+        """Reset per-level input state: pending commands, undo history, dirty cells"""
+        self.commands.reset()
+        self.journal.reset()
+        self.changed_cells = set()
+    
+    def take_changed_cells(self):
+        """Return the cells changed since the last call and reset the set"""
+        changed = self.changed_cells
+        self.changed_cells = set()
+        return changed
+    
+    def set_cell(self, grid, objectives, y, x, char):
+        """Write a character into the map, patching its row's tile classes and the objectives"""
+        old_row = grid.row_bytes(y, grid.ORIGINAL)
+        old_classes = bytes(grid.tile_row(y))
+        self.journal.record(y, x, chr(old_row[x]), char)
+        grid.set_original(y, x, char)
+        self.changed_cells.add((y, x))
+        
+        # Runes/gems can only change within the edited row
+        new_row = grid.row_bytes(y, grid.ORIGINAL)
+        objectives.runes_remaining += count_runes(new_row) - count_runes(old_row)
+        objectives.gems_total += count_gems(new_row) - count_gems(old_row)
+        
+        # Reclassify the row so words/gems that grew or shrank are recolored
+        new_classes = grid.tile_row(y)
+        for test_x in range(grid.width):
+            if new_classes[test_x] != old_classes[test_x]:
+                self.changed_cells.add((y, test_x))
+    
+    def gem_start(self, grid, y, x):
+        """Position of the first cell of the gem covering (y, x)"""
+        tiles = grid.tile_row(y)
+        while x > 0 and tiles[x - 1] == TileClass.GEM.value:
+            x -= 1
+        return (y, x)
+    
+    def finish_word(self, grid, objectives, y, x):
+        """Count the word typed in insert mode that ends just before (y, x)"""
+        if not objectives.typing:
+            return False, None
+        objectives.typing = False
+        row = grid.row(y, grid.ORIGINAL)
+        start = x
+        while start > 0 and row[start - 1].isalpha():
+            start -= 1
+        if start == x:
+            return False, None
+        word = row[start:x]
+        if objectives.word_typed(word, (y, start)):
+            return objectives.is_complete(), "You typed the magic word!"
+        if word == objectives.target_word:
+            return False, "The magic word only works where the map asks for it"
+        return False, None
+    
+    def handle_normal_mode(self, key, grid, objectives, player_position, current_level):
         """Handle input in normal mode"""
         y, x = player_position
         old_y, old_x = y, x
         level_completed = False
         message = None
         
-        # Movement (Vim-like)
-        if key == 'h':  # left
-            x = max(0, x - 1)
-        elif key == 'j':  # down
-            y = min(len(game_map) - 1, y + 1)
-        elif key == 'k':  # up
-            y = max(0, y - 1)
-        elif key == 'l':  # right
-            x = min(len(game_map[0]) - 1, x + 1)
-        elif key == 'x':  # Delete character
-            if game_map[y][x] == 'X':
-                game_map[y][x] = ' '
-                original_map[y][x] = ' '  # Also update original map
-                message = "You removed a rune!"
-                
-                # Check if level is complete (no more X)
-                if current_level == 2 and not any('X' in row for row in game_map):
-                    level_completed = True
-        elif key == 'w':  # Word movement (forward)
-            # Implement word movement - jump to next word
-            if current_level >= 3:  # Only active in level 4+
-                found = False
-                # Look ahead for the next word
-                for test_x in range(x + 1, len(game_map[y])):
-                    if game_map[y][test_x].isalpha() and (test_x == 0 or not game_map[y][test_x-1].isalpha()):
-                        x = test_x
-                        found = True
-                        break
-                
-                if not found:
-                    # Try the next line
-                    for test_y in range(y + 1, len(game_map)):
-                        for test_x in range(len(game_map[test_y])):
-                            if game_map[test_y][test_x].isalpha() and (test_x == 0 or not game_map[test_y][test_x-1].isalpha()):
-                                y = test_y
-                                x = test_x
-                                found = True
-                                break
-                        if found:
-                            break
-        elif key == 'b':  # Word movement (backward)
-            # Implement backward word movement
-            if current_level >= 4:  # Only active in level 5+
-                found = False
-                # Look backward for the previous word
-                for test_x in range(x - 1, -1, -1):
-                    if game_map[y][test_x].isalpha() and (test_x == len(game_map[y])-1 or not game_map[y][test_x+1].isalpha()):
-                        x = test_x
-                        found = True
-                        break
-                
-                if not found:
-                    # Try the previous line
-                    for test_y in range(y - 1, -1, -1):
-                        for test_x in range(len(game_map[test_y])-1, -1, -1):
-                            if game_map[test_y][test_x].isalpha() and (test_x == len(game_map[test_y])-1 or not game_map[test_y][test_x+1].isalpha()):
-                                y = test_y
-                                x = test_x
-                                found = True
-                                break
-                        if found:
-                            break
+        # Keys are collected into [count]command and looked up in the command tables
+        command = self.commands.feed(key)
+        if command is None:
+            return player_position, level_completed, message
+        name, count = command
+        
+        if name in MOTIONS:
+            # A counted motion is resolved in one step and moves the player once
+            if name not in ABSOLUTE_MOTIONS:
+                count = count or 1
+            y, x = MOTIONS[name](grid, y, x, count, current_level)
+        elif name in OPERATORS:
+            # Each operator is one undo step
+            y, x, level_completed, message = OPERATORS[name](self, grid, objectives, y, x, count or 1)
+            self.journal.commit()
         
         # Check if movement is valid
-        if game_map[y][x] != '#':  # Not a wall
+        if grid.get(y, x) != '#' and (y, x) != (old_y, old_x):  # Moved, and not into a wall
             # Check for special tiles
-            if game_map[y][x] == 'O':  # Portal/goal
+            objectives.portal_reached = grid.get(y, x) == 'O'
+            if grid.tile(y, x) is TileClass.GEM and objectives.collect_gem(self.gem_start(grid, y, x)):
+                message = f"You collected a gem! ({objectives.gems_collected}/{objectives.gems_total})"
+            if objectives.is_complete():
                 level_completed = True
+            elif objectives.portal_reached and "portal" in objectives.goals:
+                message = "The portal is sealed until the goal is complete"
                 
             # Update position and map
             # First, restore the original cell at old position
-            game_map[old_y][old_x] = original_map[old_y][old_x]
-            
-            # Store what's currently at the new position (for restoration later)
-            current_cell = game_map[y][x]
+            grid.set(old_y, old_x, grid.original(old_y, old_x))
             
             # Place player at new position
-            game_map[y][x] = 'P'
+            grid.set(y, x, 'P')
             player_position[0] = y
             player_position[1] = x
+            self.changed_cells.add((old_y, old_x))
+            self.changed_cells.add((y, x))
         
-        return game_map, original_map, player_position, level_completed, message
+        return player_position, level_completed, message
     
-    def handle_insert_mode(self, key, game_map, original_map, player_position, current_level):
+    def handle_insert_mode(self, key, grid, objectives, player_position, current_level):
         """Handle input in insert mode"""
         y, x = player_position
         level_completed = False
@@ -107,29 +129,48 @@ class GameLogic:
         
         # Place character at cursor position if printable
         if 32 <= ord(key) <= 126:
-            game_map[y][x] = key
-            original_map[y][x] = key  # Update original map too
+            if not key.isalpha():
+                # A space or symbol ends the word typed so far
+                level_completed, message = self.finish_word(grid, objectives, y, x)
+            self.set_cell(grid, objectives, y, x, key)
+            if key.isalpha():
+                objectives.typing = True
             
             # Move cursor right
-            if x < len(game_map[0]) - 2:
+            if x < grid.width - 2:
                 x += 1
-                # Restore original content at new position before moving player
-                current_cell = original_map[y][x]
                 player_position[0] = y
                 player_position[1] = x
-                game_map[y][x] = 'P'
+                grid.set(y, x, 'P')
+                self.changed_cells.add((y, x))
         
-        # For level 1, check if "wizard" was typed (called only after ESC in the UI)
-        if current_level == 1:
-            map_text = game_map[4]
-            typed_text = ''.join(map_text[3:9])
-            if typed_text == "wizard":
-                message = "You typed the magic word!"
-                level_completed = True
-                
-        return game_map, original_map, player_position, level_completed, message
+        return player_position, level_completed, message
+    
+    def handle_escape(self, grid, objectives, player_position):
+        """Leave insert mode, finishing the word being typed"""
+        y, x = player_position
+        # Everything typed in one insert session is undone together
+        self.journal.commit()
+        return self.finish_word(grid, objectives, y, x)
+    
+    def apply_edits(self, grid, objectives, player_position, group, undo):
+        """Write a journal group back (old text when undoing, new text when redoing)
+        
+        Returns the first changed cell, where the cursor goes.
+        """
+        self.journal.paused = True
+        runs = reversed(group) if undo else group
+        for y, x, old, new in runs:
+            for i, char in enumerate(old if undo else new):
+                self.set_cell(grid, objectives, y, x + i, char)
+        self.journal.paused = False
+        
+        # The player glyph stays on top of a cell that was rewritten under it
+        py, px = player_position
+        grid.set(py, px, 'P')
+        return group[0][0], group[0][1]
     
-    def handle_visual_mode(self, key, game_map, original_map, player_position):
+    def handle_visual_mode(self, key, grid, player_position):
         """Handle input in visual mode"""
         message = None
         
@@ -139,4 +180,4 @@ class GameLogic:
         elif key == 'd':
             message = "Text deleted! (Visual mode demonstration)"
             
-        return game_map, original_map, player_position, message
\ No newline at end of file
+        return player_position, message
\ No newline at end of file
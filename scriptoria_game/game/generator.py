@@ -0,0 +1,139 @@
+import random
+from models.level import Level
+
+# Words for word lines and typing targets; lowercase so they never form a rune (X) or portal (O)
+WORDS = (
+    "wizard", "scroll", "quill", "spell", "glyph", "tome", "ink", "cursor", "buffer", "motion",
+    "yank", "macro", "vault", "lexicon", "sigil", "parchment", "verse", "cipher", "script", "lantern",
+    "amber", "raven", "willow", "ember", "tower", "riddle", "charm", "token", "marker", "line",
+)
+
+# Level kinds, played in rotation
+KINDS = ("runes", "words", "gems", "typing")
+
+def blank_rows(rng):
+    """A walled, empty map of random size as lists of characters"""
+    height = rng.randint(8, 12)
+    width = rng.randint(30, 40)
+    rows = [['#'] * width]
+    rows += [['#'] + [' '] * (width - 2) + ['#'] for _ in range(height - 2)]
+    rows.append(['#'] * width)
+    return rows
+
+def write(rows, y, x, text):
+    """Write text into a row starting at column x"""
+    rows[y][x:x + len(text)] = text
+
+def free_cells(rows, y):
+    """Interior columns of row y that are blank, as are both their neighbours"""
+    row = rows[y]
+    return [x for x in range(2, len(row) - 2) if row[x - 1] == row[x] == row[x + 1] == ' ']
+
+def word_line(rng, width):
+    """Random words separated by 1-3 spaces, fitting in width columns"""
+    words = []
+    length = 0
+    while True:
+        word = rng.choice(WORDS)
+        gap = rng.randint(1, 3) if words else 0
+        if length + gap + len(word) > width:
+            return ''.join(words)
+        words.append(' ' * gap + word)
+        length += gap + len(word)
+
+def finish(rows):
+    """Row strings of a map"""
+    return [''.join(row) for row in rows]
+
+def rune_level(rng, number):
+    """A field of runes to delete with x"""
+    rows = blank_rows(rng)
+    height = len(rows)
+    rows[rng.randrange(1, height - 1)][1] = 'P'
+    count = rng.randint(5, 12)
+    # Runes sit two columns apart so each one stays a standalone token
+    spots = [(y, x) for y in range(1, height - 1) for x in range(3, len(rows[0]) - 2, 2)]
+    for y, x in rng.sample(spots, count):
+        rows[y][x] = 'X'
+    return Level(f"Practice {number}: Rune Field",
+                 "A fresh field of runes has appeared.",
+                 f"Delete all {count} runes (X) with 'x'",
+                 "Counts help: 5l moves five cells, then x removes the rune",
+                 finish(rows), goals=("runes",))
+
+def word_level(rng, number):
+    """Lines of words to cross with w, b and e on the way to the portal"""
+    rows = blank_rows(rng)
+    height = len(rows)
+    width = len(rows[0])
+    rows[1][2] = 'P'
+    for y in range(2, height - 2, 2):
+        indent = rng.randint(2, 4)
+        write(rows, y, indent, word_line(rng, width - indent - 2))
+    y = height - 2
+    rows[y][rng.choice(free_cells(rows, y))] = 'O'
+    return Level(f"Practice {number}: Word Lines",
+                 "The path is written in words.",
+                 "Reach the portal (O), jumping along the words with w, b and e",
+                 "w jumps to the next word, b back to the previous one, e to a word's end",
+                 finish(rows))
+
+def gem_level(rng, number):
+    """Gems scattered on the word lines, then the portal"""
+    rows = blank_rows(rng)
+    height = len(rows)
+    width = len(rows[0])
+    rows[1][2] = 'P'
+    count = rng.randint(2, 5)
+    lines = list(range(2, height - 2, 2))
+    for i in range(count):
+        gem = f"gem{i + 1}"
+        # Try the lines in turn until one has room with a blank cell either side
+        for j in range(len(lines)):
+            y = lines[(i + j) % len(lines)]
+            spots = [x for x in range(2, width - len(gem) - 2)
+                     if all(cell == ' ' for cell in rows[y][x - 1:x + len(gem) + 1])]
+            if spots:
+                write(rows, y, rng.choice(spots), gem)
+                break
+    y = height - 2
+    rows[y][rng.choice(free_cells(rows, y))] = 'O'
+    return Level(f"Practice {number}: Gem Hunt",
+                 "Gems glitter among the lines.",
+                 f"Collect all {count} gems, then reach the portal (O)",
+                 "Land on any letter of a gem to collect it",
+                 finish(rows), goals=("gems", "portal"))
+
+def typing_level(rng, number):
+    """A magic word to type in insert mode"""
+    rows = blank_rows(rng)
+    height = len(rows)
+    target = rng.choice(WORDS)
+    rows[1][2] = 'P'
+    # The word is typed over the sign, starting at its bracket
+    y = rng.randrange(3, height - 1)
+    write(rows, y, 2, f"[Type '{target}' here]")
+    return Level(f"Practice {number}: Incantation",
+                 "Only the right word opens the way.",
+                 f"On the '[' of the sign, press 'i', type the magic word '{target}', then press ESC",
+                 "i enters creation mode, ESC returns to movement mode",
+                 finish(rows), goals=("word",), target_word=target, target_at=(y, 2))
+
+BUILDERS = {
+    "runes": rune_level,
+    "words": word_level,
+    "gems": gem_level,
+    "typing": typing_level,
+}
+
+def generate_levels(seed=0, start=1):
+    """Yield practice levels forever; the same seed always gives the same levels
+
+    start is the number shown in the first level's name.
+    """
+    rng = random.Random(seed)
+    number = start
+    while True:
+        kind = KINDS[(number - start) % len(KINDS)]
+        yield BUILDERS[kind](rng, number)
+        number += 1
@@ -0,0 +1,205 @@
+from constants import TileClass
+from game.tiles import classify_row
+from game.word_index import WordIndex
+
+# Tile class for each byte value stored in the tile layer
+TILE_BY_VALUE = {tile.value: tile for tile in TileClass}
+
+class Grid:
+    """A level map: an immutable base shared between copies plus the rows this copy changed
+
+    The base is one bytes object of two layers, each height * width bytes
+    with row-stride indexing:
+      CELLS    - what is on screen, including the player glyph 'P'
+      ORIGINAL - the map without the player (what a cell reverts to)
+    The third layer, TILES (TileClass values), is classified lazily one base
+    row at a time into a buffer shared by all copies, since a base row
+    classifies the same way for every copy.
+    The first write to a row copies that row's three layers into an overlay,
+    so copy() (a level restart, another session) costs only the rows already
+    changed. An overlay that matches the base again (the player walked off
+    the row, an edit was undone) is dropped, so overlays follow edits rather
+    than the rows the player has visited. Characters are stored as latin-1
+    bytes. Tile classes of edited rows are recomputed lazily; the word index
+    used by w/b/e is built on first use, shared with copies, and copied
+    before this grid first edits it.
+    """
+    CELLS = 0
+    ORIGINAL = 1
+    TILES = 2
+    LAYER_COUNT = 3
+
+    def __init__(self, height, width, data, rows=None, stale=None, words=None, tiles=None, classified=None):
+        self.height = height
+        self.width = width
+        self.layer_size = height * width
+        self.data = bytes(data)
+        # Tile classes of the base rows, and one flag per row once they are filled in
+        self.tiles = tiles if tiles is not None else bytearray(self.layer_size)
+        self.classified = classified if classified is not None else bytearray(height)
+        # y -> bytearray of the row's CELLS, ORIGINAL and TILES bytes, once written
+        self.rows = rows if rows is not None else {}
+        # Overlay rows whose tile classes are out of date
+        self.stale = stale if stale is not None else set()
+        self.words = words
+        self.words_shared = words is not None
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build a grid from row strings (short rows are padded with spaces)"""
+        height = len(rows)
+        width = max((len(row) for row in rows), default=0)
+        cells = ''.join(row.ljust(width) for row in rows).encode("latin-1")
+        return cls.from_cells(height, width, cells)
+
+    @classmethod
+    def from_cells(cls, height, width, cells):
+        """Build a grid from height * width bytes of map characters (any buffer, e.g. an mmap slice)"""
+        cells = bytes(cells)
+        return cls(height, width, cells + cells.replace(b'P', b' '))
+
+    def offset(self, layer, y, x=0):
+        """Index into the base data of cell (y, x) of the CELLS or ORIGINAL layer"""
+        return layer * self.layer_size + y * self.width + x
+
+    def base_tile_row(self, y):
+        """Tile class bytes of base row y, classifying the row on first use"""
+        width = self.width
+        start = y * width
+        if not self.classified[y]:
+            original = self.offset(self.ORIGINAL, y)
+            self.tiles[start:start + width] = classify_row(self.data[original:original + width])
+            self.classified[y] = 1
+        return bytes(self.tiles[start:start + width])
+
+    def row_buffer(self, y):
+        """The writable overlay of row y, copied from the base on first use"""
+        row = self.rows.get(y)
+        if row is None:
+            width = self.width
+            row = bytearray(width * self.LAYER_COUNT)
+            for layer in (self.CELLS, self.ORIGINAL):
+                start = self.offset(layer, y)
+                row[layer * width:(layer + 1) * width] = self.data[start:start + width]
+            row[2 * width:] = self.base_tile_row(y)
+            self.rows[y] = row
+        return row
+
+    def release_row(self, y):
+        """Drop the overlay of row y if it matches the base again"""
+        row = self.rows[y]
+        width = self.width
+        for layer in (self.CELLS, self.ORIGINAL):
+            start = self.offset(layer, y)
+            if row[layer * width:(layer + 1) * width] != self.data[start:start + width]:
+                return
+        del self.rows[y]
+        self.stale.discard(y)
+
+    def get(self, y, x):
+        """Character on screen at (y, x)"""
+        row = self.rows.get(y)
+        if row is not None:
+            return chr(row[x])
+        return chr(self.data[self.offset(self.CELLS, y, x)])
+
+    def set(self, y, x, char):
+        """Set the character on screen at (y, x)"""
+        value = ord(char)
+        self.row_buffer(y)[x] = value
+        if value == self.data[self.offset(self.CELLS, y, x)]:
+            self.release_row(y)
+
+    def original(self, y, x):
+        """Character of the map without the player at (y, x)"""
+        row = self.rows.get(y)
+        if row is not None:
+            return chr(row[self.width + x])
+        return chr(self.data[self.offset(self.ORIGINAL, y, x)])
+
+    def set_original(self, y, x, char):
+        """Set the map character at (y, x) in both the screen and original layers"""
+        row = self.row_buffer(y)
+        row[x] = ord(char)
+        row[self.width + x] = ord(char)
+        self.stale.add(y)
+        if self.words is not None:
+            if self.words_shared:
+                self.words = self.words.copy()
+                self.words_shared = False
+            self.words.update_row(y, self.row_bytes(y, self.ORIGINAL))
+        if row[self.width + x] == self.data[self.offset(self.ORIGINAL, y, x)]:
+            self.release_row(y)
+
+    def row(self, y, layer=CELLS):
+        """Row y of a layer as a string"""
+        return self.row_bytes(y, layer).decode("latin-1")
+
+    def row_bytes(self, y, layer=CELLS):
+        """Row y of a layer as bytes"""
+        row = self.rows.get(y)
+        if row is None:
+            if layer == self.TILES:
+                return self.base_tile_row(y)
+            start = self.offset(layer, y)
+            return self.data[start:start + self.width]
+        if layer == self.TILES and y in self.stale:
+            return self.tile_row(y)
+        return bytes(row[layer * self.width:(layer + 1) * self.width])
+
+    def tile_row(self, y):
+        """Tile class bytes of row y, (re)classifying the row if needed"""
+        if y in self.stale:
+            row = self.rows[y]
+            width = self.width
+            row[2 * width:3 * width] = classify_row(bytes(row[width:2 * width]))
+            self.stale.discard(y)
+        return self.row_bytes(y, self.TILES)
+
+    def tile(self, y, x):
+        """TileClass of cell (y, x)"""
+        row = self.rows.get(y)
+        if row is None:
+            if not self.classified[y]:
+                self.base_tile_row(y)
+            return TILE_BY_VALUE[self.tiles[y * self.width + x]]
+        if y in self.stale:
+            self.tile_row(y)
+        return TILE_BY_VALUE[row[2 * self.width + x]]
+
+    def layer_bytes(self, layer=CELLS):
+        """A whole layer as bytes, with this grid's changes applied"""
+        if layer == self.TILES:
+            for y in range(self.height):
+                if not self.classified[y]:
+                    self.base_tile_row(y)
+            base = bytes(self.tiles)
+        else:
+            start = self.offset(layer, 0)
+            base = self.data[start:start + self.layer_size]
+        if not self.rows:
+            return base
+        data = bytearray(base)
+        for y in self.rows:
+            row_start = y * self.width
+            data[row_start:row_start + self.width] = self.row_bytes(y, layer)
+        return bytes(data)
+
+    def word_index(self):
+        """The WordIndex of the original layer, built on first use"""
+        if self.words is None:
+            self.words = WordIndex.build(self)
+            self.words_shared = False
+        return self.words
+
+    def copy(self):
+        """Independent copy: shares the base, its tile classes and the word index, copies only changed rows"""
+        if self.words is not None:
+            # Whichever grid edits first copies the index
+            self.words_shared = True
+        rows = {y: bytearray(row) for y, row in self.rows.items()}
+        return Grid(self.height, self.width, self.data, rows, set(self.stale), self.words,
+                    self.tiles, self.classified)
+
+    def __len__(self):
+        return self.height
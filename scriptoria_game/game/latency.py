@@ -0,0 +1,100 @@
+import csv
+import math
+import time
+from collections import deque
+
+class LatencyHistogram:
+    """Fixed-size histogram of durations with logarithmic buckets
+
+    Each power of two of microseconds is split into BUCKETS_PER_OCTAVE
+    buckets, so percentiles are accurate to about 9% from 1 us up to about
+    four seconds; longer durations share the last bucket.
+    """
+    BUCKETS_PER_OCTAVE = 8
+    OCTAVES = 22
+
+    def __init__(self):
+        self.counts = [0] * (self.BUCKETS_PER_OCTAVE * self.OCTAVES + 1)
+        self.count = 0
+
+    def add(self, seconds):
+        """Count one duration"""
+        micros = seconds * 1e6
+        bucket = int(math.log2(micros) * self.BUCKETS_PER_OCTAVE) if micros > 1 else 0
+        self.counts[min(bucket, len(self.counts) - 1)] += 1
+        self.count += 1
+
+    def percentile(self, fraction):
+        """Upper bound in seconds of the bucket holding the given fraction (0-1) of durations"""
+        if not self.count:
+            return 0.0
+        target = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return 2 ** ((bucket + 1) / self.BUCKETS_PER_OCTAVE) / 1e6
+
+class LatencyStats:
+    """Input-to-paint latency of key events
+
+    A frontend calls receive() when a key event arrives, handled() once the
+    game logic has processed it and painted() after the next paint. Paints are
+    coalesced, so one painted() completes every key handled since the last.
+    Durations go into fixed-size histograms; the most recent events are also
+    kept (up to capacity) for export_csv().
+    """
+    PHASES = ("handler", "paint", "total")
+
+    def __init__(self, capacity=10000):
+        self.start = time.perf_counter()
+        self.received = None
+        # (key, received, handled) of keys not painted yet
+        self.pending = []
+        self.histograms = {phase: LatencyHistogram() for phase in self.PHASES}
+        self.events = deque(maxlen=capacity)
+
+    def receive(self):
+        """Note the arrival time of a key event"""
+        self.received = time.perf_counter()
+
+    def handled(self, key):
+        """Note that the game logic has finished with the key received last"""
+        now = time.perf_counter()
+        received = self.received if self.received is not None else now
+        self.pending.append((key, received, now))
+        self.received = None
+
+    def painted(self):
+        """Complete every handled key now that its result is on screen"""
+        if not self.pending:
+            return
+        now = time.perf_counter()
+        histograms = self.histograms
+        for key, received, handled in self.pending:
+            histograms["handler"].add(handled - received)
+            histograms["paint"].add(now - handled)
+            histograms["total"].add(now - received)
+            self.events.append((key, received, handled, now))
+        self.pending.clear()
+
+    def summary(self):
+        """One line per phase: p50/p95/p99 in milliseconds and the event count"""
+        lines = []
+        for phase in self.PHASES:
+            histogram = self.histograms[phase]
+            p50, p95, p99 = (histogram.percentile(fraction) * 1000 for fraction in (0.5, 0.95, 0.99))
+            lines.append(f"{phase:>7}: p50 {p50:.2f}  p95 {p95:.2f}  p99 {p99:.2f} ms  ({histogram.count})")
+        return lines
+
+    def export_csv(self, path):
+        """Write the kept events to a CSV file, times in milliseconds since start"""
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["key", "received_ms", "handler_ms", "paint_ms", "total_ms"])
+            for key, received, handled, painted in self.events:
+                writer.writerow([key if key.isprintable() else repr(key),
+                                 f"{(received - self.start) * 1000:.3f}",
+                                 f"{(handled - received) * 1000:.3f}",
+                                 f"{(painted - handled) * 1000:.3f}",
+                                 f"{(painted - received) * 1000:.3f}"])
@@ -1,38 +1,25 @@
-from models.level import Level
+import os
+from game.grid import Grid
+from game.objectives import Objectives
+from game.level_pack import TemplateCache
+from game.compiled_pack import open_pack
+
+# The levels that ship with the game
+BUILTIN_PACK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "levels", "builtin.pack")
 
 class LevelManager:
-    def __init__(self):
+    def __init__(self, pack_path=None, cache_size=32):
+        self.pack_path = pack_path or BUILTIN_PACK
         self.levels = []
+        # Parsed maps of recently played levels, keyed by Level: (grid, objectives, player position)
+        self.templates = TemplateCache(cache_size)
         self.setup_levels()
         
     def setup_levels(self):
-        """Initialize all game levels"""
-        self.levels = [
-            Level("The Path Begins", 
-                  "Welcome to Scriptoria, young apprentice. Learn to navigate the text realm.",
-                  "Move to the glowing portal (O) using h, j, k, l keys",
-                  "Press h for left, j for down, k for up, l for right"),
-            
-            Level("The Dual States", 
-                  "A text wizard must know when to observe and when to create.",
-                  "Press 'i' to enter insert mode, type the magic word 'wizard', then press ESC",
-                  "i enters creation mode, ESC returns to movement mode"),
-            
-            Level("The Deletion Arts",
-                  "Sometimes removing text is as powerful as creating it.",
-                  "Delete the evil runes (X) using 'x' in normal mode",
-                  "Move to a rune, press 'x' to remove it"),
-            
-            Level("The Word Traveler",
-                  "A skilled text wizard can leap across words with a single command.",
-                  "Jump to the end of each word using 'w' and reach the portal",
-                  "Press 'w' to jump to the start of the next word"),
-            
-            Level("Backward Motion",
-                  "Moving backward is just as important as moving forward.",
-                  "Use 'b' to jump backward to previous words and collect all gems",
-                  "Press 'b' to jump to the start of the previous word")
-        ]
+        """Initialize all game levels from the level pack (through its compiled cache)"""
+        self.pack = open_pack(self.pack_path)
+        self.levels = self.pack.levels()
+        self.templates.clear()
     
     def get_level(self, index):
         """Get a level by index"""
@@ -44,81 +31,44 @@ class LevelManager:
         """Get all levels"""
         return self.levels
         
+    def add_level(self, level, template=None):
+        """Append a level (e.g. a generated one), optionally with its prebuilt template; return its index"""
+        self.levels.append(level)
+        if template is not None:
+            self.templates.put(level, template)
+        return len(self.levels) - 1
+        
     def create_map(self, level_num):
-        """Create a map for the specified level number"""
-        game_map = []
-        player_position = [0, 0]
+        """Create a map for the specified level number
         
-        if level_num == 0:  # First level - movement
-            game_map = [
-                list("##############################"),
-                list("#                            #"),
-                list("#  P                         #"),
-                list("#                            #"),
-                list("#                            #"),
-                list("#                          O #"),
-                list("#                            #"),
-                list("##############################")
-            ]
-            player_position = [2, 3]  # P position
-        elif level_num == 1:  # Second level - modes
-            game_map = [
-                list("##############################"),
-                list("#                            #"),
-                list("#  P                         #"),
-                list("#                            #"),
-                list("#  [Type 'wizard' here]      #"),
-                list("#                            #"),
-                list("#                            #"),
-                list("##############################")
-            ]
-            player_position = [2, 3]
-        elif level_num == 2:  # Third level - deletion
-            game_map = [
-                list("##############################"),
-                list("#                            #"),
-                list("#  P     X     X     X       #"),
-                list("#                            #"),
-                list("#    X     X     X     X     #"),
-                list("#                          O #"),
-                list("#                            #"),
-                list("##############################")
-            ]
-            player_position = [2, 3]
-        elif level_num == 3:  # Word movement
-            game_map = [
-                list("##############################"),
-                list("#                            #"),
-                list("#  P  word1  word2  word3    #"),
-                list("#                            #"),
-                list("#    word4  word5  word6   O #"),
-                list("#                            #"),
-                list("#                            #"),
-                list("##############################")
-            ]
-            player_position = [2, 3]
-        elif level_num == 4:  # Backward movement
-            game_map = [
-                list("##############################"),
-                list("#                            #"),
-                list("#             P              #"),
-                list("#                            #"),
-                list("#  gem1  gem2  gem3  gem4    #"),
-                list("#                          O #"),
-                list("#                            #"),
-                list("##############################")
-            ]
-            player_position = [2, 13]
-            
-        # Create a deep copy of the map without player to preserve elements
-        original_map = []
-        for row in game_map:
-            new_row = []
-            for cell in row:
-                if cell == 'P':
-                    new_row.append(' ')  # Don't include player in original map
-                else:
-                    new_row.append(cell)
-            original_map.append(new_row)
+        Returns the Grid, the level's Objectives and the player position. The
+        map is parsed the first time the level is played and kept as a
+        template (with its word index built) in an LRU cache.
+        Every call returns a copy-on-write Grid over the template, so a
+        restart does not copy the map.
+        """
+        level = self.levels[level_num]
+        template = self.templates.get(level)
+        if template is None:
+            template = self.build_template(level)
+            self.templates.put(level, template)
+        grid, objectives, player_position = template
+        return grid.copy(), objectives.copy(), list(player_position)
+    
+    def build_template(self, level):
+        """Parse a level's map into a Grid with its word index, its Objectives and the start"""
+        if level.cells_loader is not None:
+            # Compiled packs hand out fixed-width cells straight from the mapped file
+            grid = Grid.from_cells(*level.cells_loader())
+        else:
+            grid = Grid.from_rows(level.map_rows)
+        objectives = Objectives.from_grid(grid, level)
+        grid.word_index()
+        
+        # The player starts wherever the template has its 'P'
+        player_position = (0, 0)
+        start = grid.layer_bytes(grid.CELLS).find(b'P')
+        if start != -1:
+            player_position = divmod(start, grid.width)
             
-        return game_map, original_map, player_position
\ No newline at end of file
+        return grid, objectives, player_position
\ No newline at end of file
@@ -0,0 +1,152 @@
+import re
+from collections import OrderedDict
+from models.level import Level
+
+# A pack is UTF-8 text; each level is a header line, metadata lines, a
+# separator and the map rows:
+#
+#   === The Path Begins
+#   description: Welcome to Scriptoria, young apprentice.
+#   goal: Move to the glowing portal (O)
+#   tutorial: Press h for left, j for down, k for up, l for right
+#   goals: portal
+#   ---
+#   ##########
+#   #P     O #
+#   ##########
+#
+# A "word" goal names its target_word and, with target_at: y,x, the map cell
+# where the word's first letter must be typed.
+#
+# Lines before the first header starting with '#' are comments. Lines may end
+# in LF or CRLF (e.g. a checkout with core.autocrlf).
+LEVEL_HEADER = b"=== "
+MAP_SEPARATOR = re.compile(rb"\r?\n---\r?\n")
+METADATA_KEYS = ("description", "goal", "tutorial", "goals", "target_word", "target_at")
+
+def find_header(data, start):
+    """Offset of the first level header line at or after start, or -1"""
+    if data.startswith(LEVEL_HEADER, start):
+        return start
+    i = data.find(b"\n" + LEVEL_HEADER, start)
+    return -1 if i == -1 else i + 1
+
+class LevelPack:
+    """A level pack file indexed by byte offsets
+
+    Opening a pack reads only the metadata of each level; map text stays in
+    the file until read_map() is asked for it, so the cost of a large pack is
+    one scan for headers rather than parsing every map.
+    """
+    def __init__(self, path):
+        self.path = path
+        # (metadata dict, map offset, map length) per level
+        self.entries = []
+        with open(path, "rb") as f:
+            data = f.read()
+        start = find_header(data, 0)
+        while start != -1:
+            separator = MAP_SEPARATOR.search(data, start)
+            if separator is None:
+                raise ValueError(f"{path}: level at byte {start} has no '---' line before its map")
+            map_offset = separator.end()
+            next_start = find_header(data, map_offset)
+            map_end = len(data) if next_start == -1 else next_start
+            metadata = self.parse_header(data[start:separator.start()].decode("utf-8"))
+            self.entries.append((metadata, map_offset, map_end - map_offset))
+            start = next_start
+
+    def parse_header(self, text):
+        """Name and metadata fields of one level header"""
+        lines = text.split("\n")
+        metadata = {"name": lines[0][len(LEVEL_HEADER):].strip()}
+        for line in lines[1:]:
+            key, _, value = line.partition(":")
+            key = key.strip()
+            if key not in METADATA_KEYS:
+                raise ValueError(f"{self.path}: unknown level field {key!r} in {metadata['name']!r}")
+            metadata[key] = value.strip()
+        return metadata
+
+    def read_map(self, index):
+        """Map rows of a level, read from the file"""
+        _, offset, length = self.entries[index]
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            text = f.read(length).decode("utf-8").replace("\r\n", "\n")
+        return text.rstrip("\n").split("\n")
+
+    def map_line(self, index):
+        """Line number (from 1) of a level's first map row in the file"""
+        _, offset, _ = self.entries[index]
+        with open(self.path, "rb") as f:
+            return f.read(offset).count(b"\n") + 1
+
+    def levels(self):
+        """Level objects whose map rows are read from the pack on demand"""
+        return [level_from_metadata(metadata, lambda index=index: self.read_map(index))
+                for index, (metadata, _, _) in enumerate(self.entries)]
+
+    def __len__(self):
+        return len(self.entries)
+
+def parse_position(text):
+    """(y, x) from a "y,x" metadata value, or None if it is empty"""
+    if not text:
+        return None
+    y, x = (int(part) for part in text.split(","))
+    return y, x
+
+def level_from_metadata(metadata, map_loader, cells_loader=None):
+    """Build a Level from a pack's metadata fields"""
+    goals = tuple(goal.strip() for goal in metadata.get("goals", "portal").split(","))
+    return Level(metadata["name"], metadata.get("description", ""), metadata.get("goal", ""),
+                 metadata.get("tutorial", ""), goals=goals,
+                 target_word=metadata.get("target_word") or None,
+                 map_loader=map_loader, cells_loader=cells_loader,
+                 target_at=parse_position(metadata.get("target_at")))
+
+def write_pack(path, levels):
+    """Write levels to a pack file"""
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write("# Scriptoria level pack\n")
+        for level in levels:
+            f.write(f"\n=== {level.name}\n")
+            f.write(f"description: {level.description}\n")
+            f.write(f"goal: {level.goal}\n")
+            f.write(f"tutorial: {level.tutorial}\n")
+            f.write(f"goals: {', '.join(level.goals)}\n")
+            if level.target_word:
+                f.write(f"target_word: {level.target_word}\n")
+            if level.target_at:
+                f.write(f"target_at: {level.target_at[0]},{level.target_at[1]}\n")
+            f.write("---\n")
+            for row in level.map_rows:
+                f.write(row + "\n")
+
+class TemplateCache:
+    """Bounded least-recently-used cache of parsed map templates"""
+    def __init__(self, capacity=32):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        """Cached template, or None; marks it most recently used"""
+        template = self.entries.get(key)
+        if template is not None:
+            self.entries.move_to_end(key)
+        return template
+
+    def put(self, key, template):
+        """Store a template, evicting the least recently used one when full"""
+        self.entries[key] = template
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """Forget every template"""
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
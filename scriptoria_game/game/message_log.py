@@ -0,0 +1,49 @@
+from collections import deque
+
+class MessageLog:
+    """Fixed-capacity ring buffer of game messages
+
+    When the buffer is full the oldest message is dropped, or appended to
+    spill_path if one is given so the full history survives on disk.
+    """
+    def __init__(self, capacity=100, spill_path=None):
+        self.messages = deque(maxlen=capacity)
+        self.spill_path = spill_path
+        self.spill_file = None
+
+    def append(self, message):
+        """Add a message, spilling the oldest one if the buffer is full"""
+        if len(self.messages) == self.messages.maxlen:
+            self.spill(self.messages[0])
+        self.messages.append(message)
+
+    def clear(self):
+        """Forget the buffered messages (spilled history is kept)"""
+        for message in self.messages:
+            self.spill(message)
+        self.messages.clear()
+
+    def spill(self, message):
+        """Write a message that leaves the buffer to the history file, if any"""
+        if not self.spill_path:
+            return
+        if self.spill_file is None:
+            self.spill_file = open(self.spill_path, "a", encoding="utf-8")
+        self.spill_file.write(message + "\n")
+
+    def recent(self, count):
+        """Return the last count messages, oldest first"""
+        return list(self.messages)[-count:]
+
+    def close(self):
+        """Spill the buffered messages, then flush and close the spill file"""
+        self.clear()
+        if self.spill_file is not None:
+            self.spill_file.close()
+            self.spill_file = None
+
+    def __len__(self):
+        return len(self.messages)
+
+    def __iter__(self):
+        return iter(self.messages)
@@ -0,0 +1,96 @@
+import re
+
+# Standalone rune tokens and gem tokens, matching the tile classification
+RUNE_TOKEN = re.compile(rb"(?<![A-Za-z0-9])X(?![A-Za-z0-9])")
+GEM_TOKEN = re.compile(rb"(?<![A-Za-z0-9])gem[A-Za-z0-9]*")
+
+# Goal names a level can list in Level.goals
+GOALS = ("portal", "runes", "gems", "word")
+
+def count_runes(row):
+    """Number of rune tokens in a row of bytes"""
+    return len(RUNE_TOKEN.findall(row))
+
+def count_gems(row):
+    """Number of gem tokens in a row of bytes"""
+    return len(GEM_TOKEN.findall(row))
+
+class Objectives:
+    """Per-level goal counters kept up to date by the edit paths
+
+    Every goal the level lists must be met; is_complete() is a constant-time
+    check instead of a rescan of the map.
+    """
+    def __init__(self, goals=("portal",), runes_remaining=0, gems_total=0, target_word=None,
+                 target_at=None):
+        self.goals = tuple(goals)
+        self.runes_remaining = runes_remaining
+        self.gems_total = gems_total
+        self.gems_collected = 0
+        # Start positions (y, x) of the gems already collected
+        self.collected = set()
+        self.portal_reached = False
+        self.words_typed = 0
+        self.target_word = target_word
+        # (y, x) the target word must start at, or None for anywhere
+        self.target_at = target_at
+        self.target_typed = False
+        # True while insert mode has typed letters that do not form a finished word yet
+        self.typing = False
+
+    @classmethod
+    def from_grid(cls, grid, level):
+        """Count the goal tiles of a freshly created map"""
+        runes = 0
+        gems = 0
+        for y in range(grid.height):
+            row = grid.row_bytes(y, grid.ORIGINAL)
+            runes += count_runes(row)
+            gems += count_gems(row)
+        return cls(level.goals, runes, gems, level.target_word, level.target_at)
+
+    def goal_met(self, goal):
+        """Check a single goal"""
+        if goal == "portal":
+            return self.portal_reached
+        elif goal == "runes":
+            return self.runes_remaining == 0
+        elif goal == "gems":
+            return self.gems_collected >= self.gems_total
+        elif goal == "word":
+            return self.target_typed
+        return False
+
+    def is_complete(self):
+        """Check whether every goal of the level is met"""
+        return all(self.goal_met(goal) for goal in self.goals)
+
+    def collect_gem(self, start):
+        """Collect the gem starting at (y, x); return True if it was not collected before"""
+        if start in self.collected:
+            return False
+        self.collected.add(start)
+        self.gems_collected += 1
+        return True
+
+    def word_typed(self, word, start):
+        """Record a word finished in insert mode at start (y, x); return True if it is the target word"""
+        self.words_typed += 1
+        if self.target_at is not None and tuple(start) != tuple(self.target_at):
+            return False
+        if self.target_word is not None and word == self.target_word:
+            self.target_typed = True
+            return True
+        return False
+
+    def copy(self):
+        """Independent copy of the counters"""
+        objectives = Objectives(self.goals, self.runes_remaining, self.gems_total, self.target_word,
+                                self.target_at)
+        objectives.gems_collected = self.gems_collected
+        objectives.collected = set(self.collected)
+        objectives.portal_reached = self.portal_reached
+        objectives.words_typed = self.words_typed
+        objectives.target_typed = self.target_typed
+        objectives.typing = self.typing
+        return objectives
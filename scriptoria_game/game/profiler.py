@@ -0,0 +1,48 @@
+import cProfile
+import io
+import pstats
+import time
+
+def default_profile_path():
+    """A per-session .pstats file name in the working directory"""
+    return time.strftime("scriptoria-%Y%m%d-%H%M%S.pstats")
+
+class Profiler:
+    """cProfile around selected calls, switched on and off while the game runs
+
+    Nothing is profiled (and no cProfile.Profile exists) until the first
+    toggle(); while off, call() sites cost one flag check. Stats from every
+    period it was on are collected in one profile and written by close().
+    """
+    def __init__(self, path=None):
+        self.path = path or default_profile_path()
+        self.profile = None
+        self.active = False
+        # Set while inside call(), so nested profiled calls are not re-entered
+        self.running = False
+
+    def toggle(self):
+        """Turn profiling on or off; return whether it is now on"""
+        self.active = not self.active
+        if self.active and self.profile is None:
+            self.profile = cProfile.Profile()
+        return self.active
+
+    def call(self, func, *args):
+        """Run func under the profiler"""
+        if self.running:
+            return func(*args)
+        self.running = True
+        try:
+            return self.profile.runcall(func, *args)
+        finally:
+            self.running = False
+
+    def close(self, top=20):
+        """Write the .pstats file; return the top functions by cumulative time, or None if nothing ran"""
+        if self.profile is None:
+            return None
+        self.profile.dump_stats(self.path)
+        output = io.StringIO()
+        pstats.Stats(self.profile, stream=output).sort_stats("cumulative").print_stats(top)
+        return output.getvalue()
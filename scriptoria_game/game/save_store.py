@@ -0,0 +1,118 @@
+import json
+import os
+import queue
+import threading
+
+# Where progress is kept unless a frontend is given another path
+DEFAULT_SAVE_PATH = os.path.join(os.path.expanduser("~"), ".scriptoria", "progress")
+
+class SaveStore:
+    """Player progress: a JSON snapshot plus an append-only journal of newer events
+
+    Events are numbered and queued to a writer thread, so recording one never
+    waits for the disk. close() stops the writer and compacts everything into
+    a new snapshot (written to a temp file and renamed into place), then drops
+    the journal. Loading replays only journal events newer than the snapshot,
+    which also covers a crash between the rename and the journal removal.
+    """
+    def __init__(self, path=DEFAULT_SAVE_PATH):
+        self.snapshot_path = path + ".json"
+        self.journal_path = path + ".journal"
+        directory = os.path.dirname(self.snapshot_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Level name -> fewest keys it was completed with
+        self.completed = {}
+        self.score = 0
+        self.keys_total = 0
+        self.seq = 0
+        self.load()
+
+        self.queue = queue.Queue()
+        self.writer = threading.Thread(target=self.write_events, name="save-writer", daemon=True)
+        self.writer.start()
+
+    def load(self):
+        """Read the snapshot, then replay the journal events written after it
+
+        A torn last line left by a crash is truncated away, so new events are
+        appended after the last complete one.
+        """
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            self.completed = snapshot.get("completed", {})
+            self.score = snapshot.get("score", 0)
+            self.keys_total = snapshot.get("keys_total", 0)
+            self.seq = snapshot.get("seq", 0)
+        if not os.path.exists(self.journal_path):
+            return
+        good_length = 0
+        with open(self.journal_path, "rb") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # A line cut short by a crash; everything after it is lost too
+                    break
+                if not line.endswith(b"\n"):
+                    # Complete JSON without its newline is still a torn write
+                    break
+                good_length += len(line)
+                if event["seq"] > self.seq:
+                    self.apply(event)
+            torn = f.seek(0, os.SEEK_END) != good_length
+        if torn:
+            # Cut the fragment off before the writer appends after it
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(good_length)
+
+    def apply(self, event):
+        """Fold one event into the in-memory progress"""
+        self.seq = event["seq"]
+        if event["event"] == "complete":
+            name = event["level"]
+            best = self.completed.get(name)
+            self.completed[name] = event["keys"] if best is None else min(best, event["keys"])
+            self.score = event["score"]
+            self.keys_total += event["keys"]
+
+    def record_completion(self, level_name, score, keys):
+        """Record a completed level; returns at once, the writer thread does the I/O"""
+        event = {"seq": self.seq + 1, "event": "complete", "level": level_name, "score": score, "keys": keys}
+        self.apply(event)
+        self.queue.put(event)
+
+    def write_events(self):
+        """Writer thread: append queued events to the journal until close()"""
+        with open(self.journal_path, "a", encoding="utf-8") as journal:
+            while True:
+                event = self.queue.get()
+                if event is not None:
+                    journal.write(json.dumps(event) + "\n")
+                # Flush once per burst of queued events
+                if event is None or self.queue.empty():
+                    journal.flush()
+                if event is None:
+                    return
+
+    def restore(self, level_manager, player):
+        """Mark saved completions on the levels and restore the score"""
+        for level in level_manager.get_all_levels():
+            if level.name in self.completed:
+                level.mark_completed()
+        player.score = self.score
+
+    def close(self):
+        """Stop the writer and compact the journal into a new snapshot"""
+        self.queue.put(None)
+        self.writer.join()
+        snapshot = {"seq": self.seq, "completed": self.completed, "score": self.score,
+                    "keys_total": self.keys_total}
+        temp_path = self.snapshot_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, indent=1)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.snapshot_path)
+        os.remove(self.journal_path)
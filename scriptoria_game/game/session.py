@@ -0,0 +1,136 @@
+from constants import Mode
+from models.player import Player
+from game.level_manager import LevelManager
+from game.game_logic import GameLogic
+from game.endless import EndlessLevels
+
+ESCAPE = '\x1b'
+
+class GameSession:
+    """One player's game without any display: map, player, mode and completion rules
+
+    Frontends feed it keys with step() and read back player, grid and the
+    messages it produced; benchmarks and agents can drive it with step_many().
+    With an endless_seed, generated practice levels follow the last level;
+    with a SaveStore, saved progress is restored and completions are recorded.
+    """
+    def __init__(self, level_manager=None, endless_seed=None, store=None):
+        self.level_manager = level_manager if level_manager is not None else LevelManager()
+        self.endless = EndlessLevels(self.level_manager, endless_seed) if endless_seed is not None else None
+        self.game_logic = GameLogic(self.level_manager)
+        self.player = Player()
+        self.grid = None
+        self.objectives = None
+        self.level_completed = False
+        # Keys pressed on the current level
+        self.keys_pressed = 0
+        # Messages produced since the last take_messages()
+        self.messages = []
+        self.store = store
+        if store is not None:
+            store.restore(self.level_manager, self.player)
+
+    def start_level(self, level_index):
+        """Build a fresh map for a level and put the player on it"""
+        while self.endless is not None and level_index >= len(self.level_manager.get_all_levels()):
+            self.endless.advance()
+        self.player.reset_for_level(level_index)
+        self.game_logic.start_level()
+        self.grid, self.objectives, self.player.position = self.level_manager.create_map(level_index)
+        self.level_completed = False
+        self.keys_pressed = 0
+        self.messages.append(f"Starting level {level_index + 1}: {self.level_manager.get_level(level_index).name}")
+
+    def take_messages(self):
+        """Return the messages produced since the last call and reset the list"""
+        messages = self.messages
+        self.messages = []
+        return messages
+
+    def take_changed_cells(self):
+        """Return the map cells changed since the last call"""
+        return self.game_logic.take_changed_cells()
+
+    def step(self, key):
+        """Apply one key (ESC is '\\x1b'); return True if it completed the level
+
+        Keys are ignored after completion until the next start_level(). ESC in
+        normal mode does nothing here; leaving the level is up to the frontend.
+        An empty key (a modifier press with no character) is ignored.
+        """
+        if not key or self.level_completed or self.grid is None:
+            return False
+        self.keys_pressed += 1
+        level_completed = False
+        message = None
+
+        if key == ESCAPE:
+            if self.player.mode == Mode.NORMAL:
+                return False
+            was_insert = self.player.mode == Mode.INSERT
+            self.player.mode = Mode.NORMAL
+            self.messages.append("Switched to normal mode")
+            # Leaving insert mode finishes the word being typed
+            if was_insert:
+                level_completed, message = self.game_logic.handle_escape(self.grid, self.objectives,
+                                                                         self.player.position)
+        elif self.player.mode == Mode.NORMAL and key == 'i':
+            self.player.mode = Mode.INSERT
+            self.game_logic.commands.reset()
+            message = "Switched to insert mode"
+        elif self.player.mode == Mode.NORMAL and key == 'v':
+            self.player.mode = Mode.VISUAL
+            self.game_logic.commands.reset()
+            message = "Switched to visual mode"
+        elif self.player.mode == Mode.NORMAL:
+            self.player.position, level_completed, message = \
+                self.game_logic.handle_normal_mode(key, self.grid, self.objectives,
+                                                   self.player.position, self.player.current_level)
+        elif self.player.mode == Mode.INSERT:
+            self.player.position, level_completed, message = \
+                self.game_logic.handle_insert_mode(key, self.grid, self.objectives,
+                                                   self.player.position, self.player.current_level)
+        elif self.player.mode == Mode.VISUAL:
+            self.player.position, message = \
+                self.game_logic.handle_visual_mode(key, self.grid, self.player.position)
+
+        if message:
+            self.messages.append(message)
+        if level_completed:
+            self.complete_level()
+        return level_completed
+
+    def step_many(self, keys):
+        """Apply keys in order, stopping at level completion; return how many were used"""
+        step = self.step
+        used = 0
+        for key in keys:
+            used += 1
+            if step(key):
+                break
+        return used
+
+    def complete_level(self):
+        """Mark the current level completed and award its points"""
+        current_level = self.player.current_level
+        level = self.level_manager.get_level(current_level)
+        level.mark_completed()
+        self.player.score += 100
+        self.level_completed = True
+        if self.store is not None:
+            # Queued for the store's writer thread; never waits for the disk
+            self.store.record_completion(level.name, self.player.score, self.keys_pressed)
+        self.messages.append(f"Level {current_level + 1} completed! +100 points")
+
+    def has_next_level(self):
+        """Check whether a level follows the current one"""
+        if self.endless is not None:
+            return True
+        return self.player.current_level + 1 < len(self.level_manager.get_all_levels())
+
+    def close(self):
+        """Stop background work and save progress"""
+        if self.endless is not None:
+            self.endless.close()
+        if self.store is not None:
+            self.store.close()
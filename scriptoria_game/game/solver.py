@@ -0,0 +1,175 @@
+import copy
+import hashlib
+import heapq
+import json
+import os
+from constants import Mode
+from game.level_manager import LevelManager
+from game.session import GameSession, ESCAPE
+
+# Bump when the search or the game rules change, so cached solutions are recomputed
+SOLVER_VERSION = 2
+
+# Motions tried by the search
+SOLVER_MOTIONS = ('h', 'j', 'k', 'l', 'w', 'b', 'e', '0', '$', 'gg', 'G')
+# Motions repeated count times; they stop at a wall or the last word, so once a
+# larger count ends where a smaller one did, every larger count does too
+REPEATED_MOTIONS = ('h', 'j', 'k', 'l', 'w', 'b', 'e')
+# Motions whose count is a row number to jump to
+ROW_MOTIONS = ('gg', 'G')
+
+def level_hash(level):
+    """Hash of everything about a level that affects its solution"""
+    content = json.dumps([SOLVER_VERSION, level.map_rows, list(level.goals), level.target_word,
+                          level.target_at and list(level.target_at)])
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+def solver_commands(level, max_count):
+    """Groups of key sequences the search may press as one step, e.g. ['l', '2l', ..., '40l']
+
+    Motions that take a count are tried with every count up to max_count. A
+    repeated motion's counts form one group in increasing order, which the
+    search cuts short once a count stops moving further; every row jump is
+    a group of its own. x is tried without a count.
+    """
+    groups = [['x']]
+    for motion in SOLVER_MOTIONS:
+        if motion in REPEATED_MOTIONS:
+            groups.append([motion] + [f"{count}{motion}" for count in range(2, max_count + 1)])
+        else:
+            groups.append([motion])
+        if motion in ROW_MOTIONS:
+            groups.extend([f"{count}{motion}"] for count in range(1, max_count + 1))
+    if level.target_word:
+        # Typing is searched as a whole word: i, the word, then ESC
+        groups.append(['i' + level.target_word + ESCAPE])
+    return groups
+
+def format_keys(keys):
+    """Readable form of a key sequence"""
+    return keys.replace(ESCAPE, "<Esc>").replace('\x12', "<C-r>")
+
+class Solver:
+    """Shortest key sequence for a level, searched over real GameSession transitions
+
+    The result is optimal among sequences built from solver_commands (every
+    motion with any count up to the map size, x, and typing the target word).
+    States are (map, player position, objective progress) after a whole
+    command; commands cost their number of keys, so the search is uniform-cost
+    BFS. Every state is replayed on one scratch session with its own
+    LevelManager, so solving never marks the player's levels completed.
+    """
+    def __init__(self, max_states=200000):
+        self.max_states = max_states
+        self.session = GameSession(LevelManager())
+
+    def state_key(self):
+        """Everything that distinguishes one search state from another"""
+        session = self.session
+        grid = session.grid
+        objectives = session.objectives
+        # The original layer, since the player glyph hides the cell under it
+        return (grid.layer_bytes(grid.ORIGINAL),
+                tuple(session.player.position), frozenset(objectives.collected),
+                objectives.portal_reached, objectives.target_typed)
+
+    def load(self, state):
+        """Put the scratch session into a saved state"""
+        grid, objectives, position = state
+        session = self.session
+        session.grid = grid.copy()
+        session.objectives = objectives.copy()
+        session.player.position = list(position)
+        session.player.mode = Mode.NORMAL
+        session.level_completed = False
+        session.game_logic.start_level()
+
+    def save(self):
+        """Snapshot the scratch session's state"""
+        session = self.session
+        return session.grid, session.objectives, tuple(session.player.position)
+
+    def solve(self, level):
+        """Return (keys, states explored); keys is None if no solution was found"""
+        session = self.session
+        # A copy, so completing the level here does not mark the caller's level
+        session.level_manager.levels = [copy.copy(level)]
+        session.start_level(0)
+        grid = session.grid
+        groups = solver_commands(level, max(grid.height, grid.width))
+
+        best = {self.state_key(): 0}
+        # (keys pressed, tie-breaker, key sequence, state or None once completed)
+        queue = [(0, 0, "", self.save())]
+        pushed = 1
+        while queue:
+            cost, _, keys, state = heapq.heappop(queue)
+            if state is None:
+                return keys, len(best)
+            for group in groups:
+                previous = None
+                for command in group:
+                    self.load(state)
+                    session.step_many(command)
+                    new_cost = cost + len(command)
+                    pushed += 1
+                    if session.level_completed:
+                        heapq.heappush(queue, (new_cost, pushed, keys + command, None))
+                        break
+                    key = self.state_key()
+                    if key == previous:
+                        # A larger count stops at the same place (a wall, the last word)
+                        break
+                    previous = key
+                    if best.get(key, new_cost + 1) <= new_cost:
+                        continue
+                    best[key] = new_cost
+                    if len(best) > self.max_states:
+                        return None, len(best)
+                    heapq.heappush(queue, (new_cost, pushed, keys + command, self.save()))
+            session.take_messages()
+        return None, len(best)
+
+class SolutionCache:
+    """Solver results stored in a JSON file, keyed by level_hash"""
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+        self.dirty = False
+
+    def get(self, level):
+        """Cached {"keys", "states"} entry for a level, or None"""
+        return self.entries.get(level_hash(level))
+
+    def put(self, level, keys, states):
+        """Remember a result"""
+        self.entries[level_hash(level)] = {"keys": keys, "states": states}
+        self.dirty = True
+
+    def save(self):
+        """Write the cache if anything changed"""
+        if not self.dirty:
+            return
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=1)
+        os.replace(temp_path, self.path)
+        self.dirty = False
+
+def solve_levels(levels, cache=None, max_states=200000):
+    """Solve levels, reusing cached results; yield (level, keys or None, states, cached)"""
+    solver = None
+    for level in levels:
+        entry = cache.get(level) if cache is not None else None
+        if entry is not None:
+            yield level, entry["keys"], entry["states"], True
+            continue
+        if solver is None:
+            solver = Solver(max_states)
+        keys, states = solver.solve(level)
+        if cache is not None:
+            cache.put(level, keys, states)
+        yield level, keys, states, False
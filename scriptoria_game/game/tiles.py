@@ -0,0 +1,36 @@
+import re
+from constants import TileClass
+
+# Tile class of a lone byte: walls, blanks, everything else is plain text
+BASE_CLASSES = bytearray([TileClass.TEXT.value] * 256)
+BASE_CLASSES[ord(' ')] = TileClass.EMPTY.value
+BASE_CLASSES[ord('#')] = TileClass.WALL.value
+BASE_CLASSES = bytes(BASE_CLASSES)
+
+TOKEN = re.compile(rb"[A-Za-z0-9]+")
+
+def token_class(token):
+    """TileClass of a run of letters/digits"""
+    if token == b'X':
+        return TileClass.RUNE
+    if token == b'O':
+        return TileClass.PORTAL
+    if token.startswith(b"gem"):
+        return TileClass.GEM
+    if not token.isdigit():
+        return TileClass.WORD
+    return TileClass.TEXT
+
+def classify_row(row):
+    """Classify every cell of a map row given as bytes, returning TileClass values as bytes
+
+    Runs of letters/digits form tokens: a lone 'X' is a rune, a lone 'O' is the
+    portal, tokens starting with "gem" are gems and any other token containing a
+    letter is a word.
+    """
+    classes = bytearray(row.translate(BASE_CLASSES))
+    for match in TOKEN.finditer(row):
+        token = match.group()
+        tile = token_class(token)
+        classes[match.start():match.end()] = bytes([tile.value]) * len(token)
+    return bytes(classes)
@@ -0,0 +1,78 @@
+from collections import deque
+
+# Rough per-run bookkeeping cost (tuple, ints, string headers) for the memory budget
+RUN_OVERHEAD = 120
+
+class UndoJournal:
+    """Undo/redo history stored as per-edit deltas instead of map snapshots
+
+    Each group is the list of edits one command made, as runs of adjacent cells
+    on a row: [y, x, old_text, new_text]. Groups are evicted oldest first when
+    the journal grows past max_bytes.
+    """
+    def __init__(self, max_bytes=256 * 1024):
+        self.max_bytes = max_bytes
+        self.undo_groups = deque()
+        self.redo_groups = []
+        self.current = None
+        self.size = 0
+        # Edits made while applying an undo/redo must not be journaled
+        self.paused = False
+
+    def reset(self):
+        """Forget all history"""
+        self.undo_groups.clear()
+        self.redo_groups = []
+        self.current = None
+        self.size = 0
+
+    def record(self, y, x, old, new):
+        """Record that cell (y, x) changed from old to new, opening a group if needed"""
+        if self.paused or old == new:
+            return
+        if self.current is None:
+            self.current = []
+        if self.current:
+            run = self.current[-1]
+            if run[0] == y and run[1] + len(run[3]) == x:
+                # Extend the run of adjacent edits (typing moves right)
+                run[2] += old
+                run[3] += new
+                return
+        self.current.append([y, x, old, new])
+
+    def commit(self):
+        """Close the open group, making it one undo step"""
+        group = self.current
+        self.current = None
+        if not group:
+            return
+        self.undo_groups.append(group)
+        self.size += self.group_size(group)
+        self.redo_groups = []
+        while self.size > self.max_bytes and len(self.undo_groups) > 1:
+            self.size -= self.group_size(self.undo_groups.popleft())
+
+    def group_size(self, group):
+        """Approximate memory used by a group"""
+        return sum(RUN_OVERHEAD + len(run[2]) + len(run[3]) for run in group)
+
+    def undo(self):
+        """Pop the newest group for undoing, or None"""
+        self.commit()
+        if not self.undo_groups:
+            return None
+        group = self.undo_groups.pop()
+        self.size -= self.group_size(group)
+        self.redo_groups.append(group)
+        return group
+
+    def redo(self):
+        """Pop the most recently undone group for redoing, or None"""
+        self.commit()
+        if not self.redo_groups:
+            return None
+        group = self.redo_groups.pop()
+        self.undo_groups.append(group)
+        self.size += self.group_size(group)
+        return group
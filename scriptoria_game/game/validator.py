@@ -0,0 +1,140 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from constants import TileClass
+from game.compiled_pack import map_problem
+from game.tiles import classify_row
+
+# Goal -> tile class that must be present (and reachable) for it
+GOAL_TILES = {
+    "portal": TileClass.PORTAL,
+    "runes": TileClass.RUNE,
+    "gems": TileClass.GEM,
+}
+
+WALL_MASK = bytes(1 if value == ord('#') else 0 for value in range(256))
+REACHED = 2
+
+def level_spec(level):
+    """The picklable part of a Level that the checks need"""
+    return level.map_rows, tuple(level.goals), level.target_word, level.target_at
+
+def reachable_cells(rows, start):
+    """One byte per cell of the map padded with a wall border, REACHED where reachable from start
+
+    The padding lets neighbours be found by index arithmetic without bounds
+    checks; cell (y, x) is at (y + 1) * (width + 2) + x + 1.
+    """
+    width = len(rows[0]) + 2
+    blocked = '#' * width
+    cells = blocked + ''.join(f"#{row}#" for row in rows) + blocked
+    # 1 for walls, 0 for open cells, 2 once reached
+    seen = bytearray(cells.encode("latin-1").translate(WALL_MASK))
+    first = (start[0] + 1) * width + start[1] + 1
+    seen[first] = REACHED
+    stack = [first]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        i = pop()
+        for j in (i - width, i + width, i - 1, i + 1):
+            if not seen[j]:
+                seen[j] = REACHED
+                push(j)
+    return seen
+
+def check_level(spec):
+    """Run every check on one level spec; return a list of failure messages"""
+    rows, goals, target_word, target_at = spec
+    if not rows:
+        return ["map is empty"]
+    problem = map_problem(rows)
+    if problem is not None:
+        # The remaining checks need a map the game can store
+        y, message = problem
+        return [f"row {y}: {message}"]
+    failures = []
+
+    # Row widths
+    width = len(rows[0])
+    for y, row in enumerate(rows):
+        if len(row) != width:
+            failures.append(f"row {y}: width {len(row)}, expected {width}")
+    if failures:
+        # The remaining checks assume a rectangular map
+        return failures
+    height = len(rows)
+
+    # Closed walls around the border
+    for y, row in enumerate(rows):
+        if y == 0 or y == height - 1:
+            gaps = [x for x, cell in enumerate(row) if cell != '#']
+        else:
+            gaps = [x for x in (0, width - 1) if row[x] != '#']
+        failures.extend(f"({y}, {x}): gap in the outer wall" for x in gaps)
+
+    # Exactly one player start
+    cells = ''.join(rows)
+    starts = []
+    i = cells.find('P')
+    while i != -1:
+        starts.append(divmod(i, width))
+        i = cells.find('P', i + 1)
+    if len(starts) != 1:
+        where = ", ".join(f"({y}, {x})" for y, x in starts)
+        failures.append(f"{len(starts)} player starts, expected 1" + (f": {where}" if where else ""))
+
+    # Goal tiles present and reachable from the start
+    tiles = [classify_row(row.replace('P', ' ').encode("latin-1")) for row in rows]
+    reachable = reachable_cells(rows, starts[0]) if starts else None
+    for goal in goals:
+        if goal == "word":
+            if not target_word:
+                failures.append("goal 'word' has no target word")
+            if target_at is not None:
+                ty, tx = target_at
+                if not (0 <= ty < height and 0 <= tx <= width - len(target_word or "")):
+                    failures.append(f"({ty}, {tx}): target word does not fit in the map there")
+                elif reachable is not None and reachable[(ty + 1) * (width + 2) + tx + 1] != REACHED:
+                    failures.append(f"({ty}, {tx}): target word position not reachable from the start")
+            continue
+        tile = GOAL_TILES.get(goal)
+        if tile is None:
+            failures.append(f"unknown goal {goal!r}")
+            continue
+        cells = tile_positions(tiles, tile.value)
+        if not cells:
+            failures.append(f"goal {goal!r} has no {tile.name.lower()} tiles")
+        elif reachable is not None:
+            failures.extend(f"({y}, {x}): {tile.name.lower()} not reachable from the start"
+                            for y, x in cells if reachable[(y + 1) * (width + 2) + x + 1] != REACHED)
+    return failures
+
+def tile_positions(tiles, value):
+    """(y, x) of every cell with a tile class value, given per-row tile bytes"""
+    positions = []
+    for y, row in enumerate(tiles):
+        x = row.find(value)
+        while x != -1:
+            positions.append((y, x))
+            x = row.find(value, x + 1)
+    return positions
+
+def check_chunk(specs):
+    """Worker entry point: check a batch of level specs"""
+    return [check_level(spec) for spec in specs]
+
+def validate_levels(levels, workers=None, chunk_size=256):
+    """Check levels across processes; yield (index, failures) for every level
+
+    workers defaults to the number of CPUs; with one worker (or one chunk)
+    the checks run in this process.
+    """
+    specs = [level_spec(level) for level in levels]
+    chunks = [specs[i:i + chunk_size] for i in range(0, len(specs), chunk_size)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) <= 1:
+        yield from enumerate(failures for results in map(check_chunk, chunks) for failures in results)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(check_chunk, chunks)
+        yield from enumerate(failures for chunk in results for failures in chunk)
@@ -0,0 +1,155 @@
+import numpy as np
+from constants import TileClass
+from game.level_manager import LevelManager
+
+# Discrete actions: the normal-mode keys an agent can press
+ACTION_KEYS = ('h', 'j', 'k', 'l', 'x')
+DELETE = ACTION_KEYS.index('x')
+# Row/column step of each action (x does not move)
+ACTION_DY = np.array([0, 1, -1, 0, 0], dtype=np.intp)
+ACTION_DX = np.array([-1, 0, 0, 1, 0], dtype=np.intp)
+
+# Rewards
+STEP_REWARD = -0.01
+RUNE_REWARD = 1.0
+GEM_REWARD = 1.0
+COMPLETE_REWARD = 10.0
+
+PLAYER = ord('P')
+SPACE = ord(' ')
+
+class VecEnv:
+    """N copies of one level stepped together as stacked uint8 arrays
+
+    Follows the GameLogic rules for h/j/k/l and x with a count of 1: walls
+    block movement, x removes the rune under the cursor, gems are collected by
+    stepping on them and the level is done once all its goals are met.
+    Observations are the on-screen characters, shape (N, height, width); the
+    returned array is reused between steps. Finished instances are reset
+    automatically, so the observation after a done flag is the new start.
+    """
+    def __init__(self, level_index, num_envs, level_manager=None, max_steps=500):
+        level_manager = level_manager if level_manager is not None else LevelManager()
+        level = level_manager.get_level(level_index)
+        if "word" in level.goals:
+            raise ValueError(f"level {level_index + 1} needs typed words, which VecEnv does not model")
+        grid, objectives, (start_y, start_x) = level_manager.create_map(level_index)
+
+        self.num_envs = num_envs
+        self.height = grid.height
+        self.width = grid.width
+        self.max_steps = max_steps
+        self.goals = level.goals
+        self.start = (start_y, start_x)
+
+        # Per-level constants, shape (height, width)
+        shape = (grid.height, grid.width)
+        self.template = np.frombuffer(grid.layer_bytes(grid.ORIGINAL), dtype=np.uint8).reshape(shape).copy()
+        tiles = np.frombuffer(grid.layer_bytes(grid.TILES), dtype=np.uint8).reshape(shape)
+        self.walls = tiles == TileClass.WALL.value
+        self.portals = tiles == TileClass.PORTAL.value
+        self.template_runes = tiles == TileClass.RUNE.value
+        self.gem_ids, self.gems_total = self.label_gems(tiles)
+        self.runes_total = int(self.template_runes.sum())
+        self.template_screen = self.template.copy()
+        self.template_screen[start_y, start_x] = PLAYER
+
+        # Per-instance state
+        self.index = np.arange(num_envs)
+        self.cells = np.empty((num_envs, self.height, self.width), dtype=np.uint8)
+        self.screen = np.empty_like(self.cells)
+        self.runes = np.empty((num_envs, self.height, self.width), dtype=bool)
+        self.collected = np.zeros((num_envs, max(1, self.gems_total)), dtype=bool)
+        self.pos_y = np.empty(num_envs, dtype=np.intp)
+        self.pos_x = np.empty(num_envs, dtype=np.intp)
+        self.runes_remaining = np.empty(num_envs, dtype=np.int32)
+        self.gems_collected = np.empty(num_envs, dtype=np.int32)
+        self.steps = np.empty(num_envs, dtype=np.int32)
+        self.reset()
+
+    @staticmethod
+    def label_gems(tiles):
+        """Give each gem token an id: (id per cell or -1, number of gems)"""
+        gem_ids = np.full(tiles.shape, -1, dtype=np.int32)
+        count = 0
+        for y, row in enumerate(tiles):
+            for x, value in enumerate(row):
+                if value != TileClass.GEM.value:
+                    continue
+                if x > 0 and row[x - 1] == TileClass.GEM.value:
+                    gem_ids[y, x] = gem_ids[y, x - 1]
+                else:
+                    gem_ids[y, x] = count
+                    count += 1
+        return gem_ids, count
+
+    def reset(self, mask=None):
+        """Restart every instance, or those where mask is True; return the observations"""
+        if mask is None:
+            mask = slice(None)
+        self.cells[mask] = self.template
+        self.screen[mask] = self.template_screen
+        self.runes[mask] = self.template_runes
+        self.collected[mask] = False
+        self.pos_y[mask] = self.start[0]
+        self.pos_x[mask] = self.start[1]
+        self.runes_remaining[mask] = self.runes_total
+        self.gems_collected[mask] = 0
+        self.steps[mask] = 0
+        return self.screen
+
+    def step(self, actions):
+        """Apply one action per instance; return (observations, rewards, dones)"""
+        actions = np.asarray(actions, dtype=np.intp)
+        index = self.index
+        y = self.pos_y
+        x = self.pos_x
+        rewards = np.full(self.num_envs, STEP_REWARD, dtype=np.float32)
+
+        # Movement, blocked by walls and the map edge
+        new_y = np.clip(y + ACTION_DY[actions], 0, self.height - 1)
+        new_x = np.clip(x + ACTION_DX[actions], 0, self.width - 1)
+        blocked = self.walls[new_y, new_x]
+        new_y[blocked] = y[blocked]
+        new_x[blocked] = x[blocked]
+        moved = (new_y != y) | (new_x != x)
+
+        # x removes the rune under the cursor
+        hit = (actions == DELETE) & self.runes[index, y, x]
+        if hit.any():
+            hit_index = index[hit]
+            self.runes[hit_index, y[hit], x[hit]] = False
+            self.cells[hit_index, y[hit], x[hit]] = SPACE
+            self.runes_remaining[hit] -= 1
+            rewards[hit] += RUNE_REWARD
+
+        # Gems are collected the first time the player steps on them
+        if self.gems_total:
+            gem = self.gem_ids[new_y, new_x]
+            on_gem = moved & (gem >= 0)
+            fresh = on_gem & ~self.collected[index, np.maximum(gem, 0)]
+            if fresh.any():
+                self.collected[index[fresh], gem[fresh]] = True
+                self.gems_collected[fresh] += 1
+                rewards[fresh] += GEM_REWARD
+
+        # Move the player glyph
+        self.screen[index, y, x] = self.cells[index, y, x]
+        self.screen[index, new_y, new_x] = PLAYER
+        self.pos_y = new_y
+        self.pos_x = new_x
+        self.steps += 1
+
+        completed = np.ones(self.num_envs, dtype=bool)
+        if "portal" in self.goals:
+            completed &= self.portals[new_y, new_x]
+        if "runes" in self.goals:
+            completed &= self.runes_remaining == 0
+        if "gems" in self.goals:
+            completed &= self.gems_collected >= self.gems_total
+        rewards[completed] += COMPLETE_REWARD
+
+        dones = completed | (self.steps >= self.max_steps)
+        if dones.any():
+            self.reset(dones)
+        return self.screen, rewards, dones
@@ -0,0 +1,12 @@
+def scroll_start(start, pos, size, length, margin):
+    """Return the new viewport start along one axis so pos stays margin cells from the edges
+
+    start is the current first visible index, size the visible extent and
+    length the extent of the map along that axis.
+    """
+    margin = min(margin, (size - 1) // 2)
+    if pos < start + margin:
+        start = pos - margin
+    elif pos >= start + size - margin:
+        start = pos - size + margin + 1
+    return max(0, min(start, length - size))
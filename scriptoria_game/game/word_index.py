@@ -0,0 +1,108 @@
+from bisect import bisect_left, bisect_right, insort
+from constants import TileClass
+from game.tiles import TOKEN, token_class
+
+# Token classes that w, b and e stop on; runes and the portal are not words
+WORD_CLASSES = (TileClass.WORD, TileClass.GEM)
+
+class WordIndex:
+    """Sorted word-start and word-end positions of a map, for w/b/e motions
+
+    Positions are stored flattened as y * width + x so that "next word after
+    the cursor, possibly on a later row" is a single bisect. The base lists
+    are never modified, so copies share them; an edited row's words go into
+    a per-index patch (row -> (starts, ends)) that replaces that row of the
+    base, so a copy costs only the rows it has edited.
+    """
+    def __init__(self, width, starts=None, ends=None, patches=None, patched_rows=None):
+        self.width = width
+        self.starts = starts if starts is not None else []
+        self.ends = ends if ends is not None else []
+        self.patches = patches if patches is not None else {}
+        # Sorted keys of patches
+        self.patched_rows = patched_rows if patched_rows is not None else []
+
+    @classmethod
+    def build(cls, grid):
+        """Index every word of the grid's original layer"""
+        index = cls(grid.width)
+        for y in range(grid.height):
+            starts, ends = index.row_words(y, grid.row_bytes(y, grid.ORIGINAL))
+            index.starts.extend(starts)
+            index.ends.extend(ends)
+        return index
+
+    def row_words(self, y, row):
+        """Flat start and end positions of the words in one row"""
+        base = y * self.width
+        starts = []
+        ends = []
+        for match in TOKEN.finditer(row):
+            if token_class(match.group()) not in WORD_CLASSES:
+                continue
+            starts.append(base + match.start())
+            ends.append(base + match.end() - 1)
+        return starts, ends
+
+    def update_row(self, y, row):
+        """Re-index one row after an edit"""
+        if y not in self.patches:
+            insort(self.patched_rows, y)
+        self.patches[y] = self.row_words(y, row)
+
+    def next_after(self, positions, which, y, x):
+        """First position after (y, x) in the base list or the patches, flattened, or None"""
+        position = y * self.width + x
+        width = self.width
+        patches = self.patches
+        # Base positions, skipping rows that are patched
+        i = bisect_right(positions, position)
+        while i < len(positions) and positions[i] // width in patches:
+            i = bisect_left(positions, (positions[i] // width + 1) * width)
+        found = positions[i] if i < len(positions) else None
+        # Patched rows in order; the first one with a position after the cursor wins
+        for row in self.patched_rows[bisect_left(self.patched_rows, y):]:
+            if found is not None and row * width > found:
+                break
+            row_positions = patches[row][which]
+            j = bisect_right(row_positions, position)
+            if j < len(row_positions):
+                if found is None or row_positions[j] < found:
+                    found = row_positions[j]
+                break
+        return found
+
+    def next_start(self, y, x):
+        """(y, x) of the first word start after (y, x), or None"""
+        found = self.next_after(self.starts, 0, y, x)
+        return None if found is None else divmod(found, self.width)
+
+    def next_end(self, y, x):
+        """(y, x) of the first word end after (y, x), or None"""
+        found = self.next_after(self.ends, 1, y, x)
+        return None if found is None else divmod(found, self.width)
+
+    def prev_end(self, y, x):
+        """(y, x) of the last word end before (y, x), or None"""
+        position = y * self.width + x
+        width = self.width
+        patches = self.patches
+        ends = self.ends
+        i = bisect_left(ends, position) - 1
+        while i >= 0 and ends[i] // width in patches:
+            i = bisect_left(ends, ends[i] // width * width) - 1
+        found = ends[i] if i >= 0 else None
+        for row in reversed(self.patched_rows[:bisect_right(self.patched_rows, y)]):
+            if found is not None and (row + 1) * width <= found:
+                break
+            row_ends = patches[row][1]
+            j = bisect_left(row_ends, position) - 1
+            if j >= 0:
+                if found is None or row_ends[j] > found:
+                    found = row_ends[j]
+                break
+        return None if found is None else divmod(found, self.width)
+
+    def copy(self):
+        """Independent copy: shares the base lists, copies only the patched rows"""
+        return WordIndex(self.width, self.starts, self.ends, dict(self.patches), list(self.patched_rows))
@@ -1,5 +1,6 @@
 import tkinter as tk
-from constants import COLORS, FONT_TYPES
+from constants import COLORS
+from gui.fonts import get_font
 
 class BaseScreen:
     """Base class for all screens in the game"""
@@ -25,9 +26,7 @@ class BaseScreen:
         return tk.Label(
             parent,
             text=text,
-            font=tk.font.Font(family=FONT_TYPES[font_type][0], 
-                             size=FONT_TYPES[font_type][1], 
-                             weight=FONT_TYPES[font_type][2]),
+            font=get_font(parent, font_type),
             fg=COLORS[color],
             bg=COLORS["bg"],
             **kwargs
@@ -39,9 +38,7 @@ class BaseScreen:
             parent,
             text=text,
             command=command,
-            font=tk.font.Font(family=FONT_TYPES[font_type][0], 
-                             size=FONT_TYPES[font_type][1], 
-                             weight=FONT_TYPES[font_type][2]),
+            font=get_font(parent, font_type),
             bg=COLORS["bg"],
             fg=COLORS["text"],
             **kwargs
@@ -0,0 +1,35 @@
+import tkinter as tk
+import tkinter.font
+from constants import FONT_TYPES
+
+class FontRegistry:
+    """Creates each FONT_TYPES font once per Tk root and hands out the shared object"""
+    def __init__(self, root):
+        self.root = root
+        self.fonts = {}
+
+    def get(self, font_type):
+        """Get the shared font for a FONT_TYPES key, creating it on first use"""
+        font = self.fonts.get(font_type)
+        if font is None:
+            family, size, weight = FONT_TYPES[font_type]
+            font = tk.font.Font(root=self.root, family=family, size=size, weight=weight)
+            self.fonts[font_type] = font
+        return font
+
+    def live_count(self):
+        """Number of named Tcl fonts currently alive in this Tk interpreter"""
+        return len(tk.font.names(self.root))
+
+def get_registry(widget):
+    """Get the font registry of the Tk root that owns widget"""
+    root = widget._root()
+    registry = getattr(root, "font_registry", None)
+    if registry is None:
+        registry = FontRegistry(root)
+        root.font_registry = registry
+    return registry
+
+def get_font(widget, font_type):
+    """Shortcut for get_registry(widget).get(font_type)"""
+    return get_registry(widget).get(font_type)
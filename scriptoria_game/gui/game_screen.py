@@ -1,11 +1,30 @@
+import time
 import tkinter as tk
 from gui.base_screen import BaseScreen
-from constants import COLORS, Mode
+from gui.fonts import get_font, get_registry
+from gui.map_renderer import create_renderer
+from game.message_log import MessageLog
+from game.viewport import scroll_start
+from constants import (COLORS, TILE_COLORS, MESSAGE_LOG_SIZE, VISIBLE_MESSAGES,
+                       VIEW_ROWS, VIEW_COLS, VIEW_MARGIN, LATENCY_OVERLAY_INTERVAL, Mode)
 
 class GameScreen(BaseScreen):
-    def __init__(self, master, game_manager):
+    def __init__(self, master, game_manager, spill_path=None, renderer="text"):
         super().__init__(master, game_manager)
-        self.messages = []
+        self.messages = MessageLog(MESSAGE_LOG_SIZE, spill_path)
+        # Number of lines currently shown in the message area
+        self.visible_lines = 0
+        self.renderer_name = renderer
+        self.cell_width = 20
+        self.cell_height = 20
+        # Viewport: first visible map row/column and the visible size in cells
+        self.view_top = 0
+        self.view_left = 0
+        self.view_rows = VIEW_ROWS
+        self.view_cols = VIEW_COLS
+        # Latency overlay state and when its text was last refreshed
+        self.overlay_visible = False
+        self.overlay_updated = 0.0
         self.setup()
     
     def setup(self):
@@ -24,8 +43,15 @@ class GameScreen(BaseScreen):
         
         # Game map canvas
         self.canvas = tk.Canvas(self.frame, bg=COLORS["bg"], highlightthickness=0)
+        # The renderer keeps one long-lived canvas item per visible cell
+        self.renderer = create_renderer(self.renderer_name, self.canvas, self.cell_width, self.cell_height)
+        self.canvas.bind("<Configure>", self.on_resize)
         self.canvas.pack(pady=10, padx=10, expand=True, fill=tk.BOTH)
         
+        # Latency overlay, placed over the map's top-right corner while shown
+        self.latency_label = self.create_label(self.canvas, text="", font_type="small", color="hint",
+                                               justify=tk.LEFT)
+        
         # Mode and messages frame
         self.status_frame = tk.Frame(self.frame, bg=COLORS["bg"])
         self.status_frame.pack(pady=5, fill=tk.X)
@@ -40,10 +66,7 @@ class GameScreen(BaseScreen):
         self.message_area = tk.Text(
             self.message_frame, 
             height=3, 
-            font=tk.font.Font(
-                family="Courier", 
-                size=12
-            ),
+            font=get_font(self.message_frame, "normal"),
             bg=COLORS["bg"], 
             fg=COLORS["text"],
             wrap=tk.WORD, 
@@ -67,8 +90,11 @@ class GameScreen(BaseScreen):
         )
         self.menu_button.pack(pady=5, side=tk.BOTTOM)
     
-    def update_display(self, player, current_level, game_map, original_map):
-        """Update the display with current game state"""
+    def update_display(self, player, current_level, grid, changed_cells=None):
+        """Update the display with current game state
+        
+        Only the cells in changed_cells are redrawn; pass None to redraw the whole map.
+        """
         level = self.game_manager.level_manager.get_level(current_level)
         mode_help = self.game_manager.game_logic.mode_help
         
@@ -83,66 +109,115 @@ class GameScreen(BaseScreen):
         # Update tutorial hint
         self.tutorial_label.config(text=f"Hint: {level.tutorial}")
         
-        # Update messages
-        self.message_area.config(state=tk.NORMAL)
-        self.message_area.delete(1.0, tk.END)
-        for msg in self.messages[-3:]:
-            self.message_area.insert(tk.END, msg + "\n")
-        self.message_area.config(state=tk.DISABLED)
-        
         # Update game map
-        self.canvas.delete("all")
-        cell_width = 20
-        cell_height = 20
-        
-        # Draw the map
-        for y, row in enumerate(game_map):
-            for x, cell in enumerate(row):
-                # Set color based on cell content
-                if cell == '#':
-                    color = COLORS["wall"]
-                elif cell == 'P':
-                    color = COLORS["player"]
-                elif cell == 'O':
-                    color = COLORS["portal"]
-                elif cell == 'X':
-                    color = COLORS["rune"]
-                elif cell.isalpha() and original_map[y][x].isalpha():
-                    # Special colored text for words
-                    color = COLORS["word"]
-                elif cell.isalpha() and "gem" in ''.join(original_map[y][x-3:x+1]):
-                    # Special color for gems
-                    color = COLORS["gem"]
-                elif cell == ' ':
-                    color = COLORS["bg"]
-                else:
-                    color = COLORS["text"]
-                
-                # Draw cell
-                if cell != ' ':
-                    x1 = x * cell_width
-                    y1 = y * cell_height
-                    x2 = x1 + cell_width
-                    y2 = y1 + cell_height
-                    
-                    # For walls, draw rectangles
-                    if cell == '#':
-                        self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="")
-                    else:
-                        # For other cells, draw text
-                        self.canvas.create_text(
-                            x1 + cell_width/2, 
-                            y1 + cell_height/2, 
-                            text=cell, 
-                            fill=color, 
-                            font=tk.font.Font(
-                                family="Courier", 
-                                size=14, 
-                                weight="bold"
-                            )
-                        )
+        if changed_cells is None:
+            # New map: start the viewport at the top-left corner
+            self.view_top = 0
+            self.view_left = 0
+        
+        scrolled = self.follow(player.position, grid)
+        if changed_cells is None or not self.renderer.items:
+            # Rebuild the item pool for the visible window
+            self.renderer.clear()
+        
+        if scrolled or not self.renderer.items:
+            # Redraw every visible cell; the cost is bounded by the viewport size
+            changed_cells = self.visible_cells(grid)
+        
+        for y, x in changed_cells:
+            if self.is_visible(y, x):
+                self.draw_cell(y, x, grid)
+    
+    def on_resize(self, event):
+        """Recompute the viewport size when the canvas changes size"""
+        view_rows = max(1, event.height // self.cell_height)
+        view_cols = max(1, event.width // self.cell_width)
+        if (view_rows, view_cols) == (self.view_rows, self.view_cols):
+            return
+        self.view_rows = view_rows
+        self.view_cols = view_cols
+        if self.renderer.items:
+            # Drop the pool; the next paint rebuilds it for the new size
+            self.renderer.clear()
+            self.game_manager.render_scheduler.request()
+    
+    def follow(self, position, grid):
+        """Scroll the viewport so the player stays inside it, return True if it moved"""
+        y, x = position
+        top = scroll_start(self.view_top, y, self.view_rows, grid.height, VIEW_MARGIN)
+        left = scroll_start(self.view_left, x, self.view_cols, grid.width, VIEW_MARGIN)
+        if (top, left) == (self.view_top, self.view_left):
+            return False
+        self.view_top = top
+        self.view_left = left
+        return True
+    
+    def is_visible(self, y, x):
+        """Check whether map cell (y, x) is inside the viewport"""
+        return (self.view_top <= y < self.view_top + self.view_rows and
+                self.view_left <= x < self.view_left + self.view_cols)
+    
+    def visible_cells(self, grid):
+        """List the map cells inside the viewport"""
+        cells = []
+        for y in range(self.view_top, min(self.view_top + self.view_rows, grid.height)):
+            for x in range(self.view_left, min(self.view_left + self.view_cols, grid.width)):
+                cells.append((y, x))
+        return cells
+    
+    def cell_color(self, y, x, grid):
+        """Pick the color for the map cell at (y, x) from its tile class"""
+        if grid.get(y, x) == 'P':
+            return COLORS["player"]
+        return COLORS[TILE_COLORS[grid.tile(y, x)]]
+    
+    def draw_cell(self, y, x, grid):
+        """Draw one map cell into its screen slot"""
+        # Items belong to screen slots, so scrolling only reconfigures them
+        slot = (y - self.view_top, x - self.view_left)
+        self.renderer.draw(slot, grid.get(y, x), self.cell_color(y, x, grid))
     
     def add_message(self, message):
-        """Add a message to the display"""
-        if message:
-            self.messages.append(message)
\ No newline at end of file
+        """Add a message to the log and append it to the message area"""
+        if not message:
+            return
+        self.messages.append(message)
+        
+        # Only the new line is inserted; the oldest visible line scrolls out
+        self.message_area.config(state=tk.NORMAL)
+        self.message_area.insert(tk.END, message + "\n")
+        if self.visible_lines == VISIBLE_MESSAGES:
+            self.message_area.delete("1.0", "2.0")
+        else:
+            self.visible_lines += 1
+        self.message_area.config(state=tk.DISABLED)
+    
+    def clear_messages(self):
+        """Clear the message log and the message area"""
+        self.messages.clear()
+        self.message_area.config(state=tk.NORMAL)
+        self.message_area.delete("1.0", tk.END)
+        self.message_area.config(state=tk.DISABLED)
+        self.visible_lines = 0
+    
+    def toggle_latency_overlay(self):
+        """Show or hide the latency overlay"""
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible:
+            # Floats over the canvas, so showing it does not resize the map
+            self.latency_label.place(relx=1.0, x=-5, y=5, anchor=tk.NE)
+            self.overlay_updated = 0.0
+        else:
+            self.latency_label.place_forget()
+    
+    def update_latency_overlay(self, stats):
+        """Show the latency percentiles, refreshing at most every LATENCY_OVERLAY_INTERVAL seconds"""
+        if not self.overlay_visible:
+            return
+        now = time.perf_counter()
+        if now - self.overlay_updated < LATENCY_OVERLAY_INTERVAL:
+            return
+        self.overlay_updated = now
+        lines = stats.summary()
+        lines.append(f"  fonts: {get_registry(self.frame).live_count()}")
+        self.latency_label.config(text="\n".join(lines))
\ No newline at end of file
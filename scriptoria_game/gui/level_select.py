@@ -4,6 +4,9 @@ from gui.base_screen import BaseScreen
 class LevelSelect(BaseScreen):
     def __init__(self, master, game_manager):
         super().__init__(master, game_manager)
+        # One button per level and the (completed, enabled) state it currently shows
+        self.level_buttons = []
+        self.button_states = []
         self.setup()
     
     def setup(self):
@@ -17,36 +20,50 @@ class LevelSelect(BaseScreen):
         title_label.pack(pady=(40, 30))
         
         # Level buttons
-        levels_frame = tk.Frame(self.frame, bg="black")
-        levels_frame.pack(pady=10)
+        self.levels_frame = tk.Frame(self.frame, bg="black")
+        self.levels_frame.pack(pady=10)
+        self.refresh()
         
-        # Get all levels
+        # Back button
+        back_button = self.create_button(
+            self.frame, 
+            text="Back to Main Menu", 
+            command=self.game_manager.show_main_menu,
+            font_type="normal"
+        )
+        back_button.pack(pady=20)
+    
+    def show(self):
+        """Bring the level buttons up to date, then show the screen"""
+        self.refresh()
+        super().show()
+    
+    def refresh(self):
+        """Add buttons for new levels and reconfigure only those whose completion changed"""
         levels = self.game_manager.level_manager.get_all_levels()
         
         for i, level in enumerate(levels):
-            level_status = "✓ " if level.is_completed() else ""
-            button_text = f"{level_status}Level {i+1}: {level.name}"
-            
             # If previous level is completed or this is the first level
             is_enabled = i == 0 or levels[i-1].is_completed()
+            state = (level.is_completed(), is_enabled)
             
-            button = self.create_button(
-                levels_frame, 
-                text=button_text, 
-                command=lambda idx=i: self.game_manager.start_level(idx),
-                font_type="normal",
-                # bg="black",
-                # fg="white" if is_enabled else "gray",
-                width=40,
+            if i == len(self.level_buttons):
+                button = self.create_button(
+                    self.levels_frame, 
+                    text="", 
+                    command=lambda idx=i: self.game_manager.start_level(idx),
+                    font_type="normal",
+                    width=40
+                )
+                button.pack(pady=5)
+                self.level_buttons.append(button)
+                self.button_states.append(None)
+            elif state == self.button_states[i]:
+                continue
+            
+            level_status = "✓ " if level.is_completed() else ""
+            self.level_buttons[i].configure(
+                text=f"{level_status}Level {i+1}: {level.name}",
                 state=tk.NORMAL if is_enabled else tk.DISABLED
             )
-            button.pack(pady=5)
-        
-        # Back button
-        back_button = self.create_button(
-            self.frame, 
-            text="Back to Main Menu", 
-            command=self.game_manager.show_main_menu,
-            font_type="normal"
-        )
-        back_button.pack(pady=20)
\ No newline at end of file
+            self.button_states[i] = state
\ No newline at end of file
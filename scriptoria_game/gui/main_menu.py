@@ -62,5 +62,8 @@ class MainMenu(BaseScreen):
                            "Basic Controls:\n" +
                            "- Movement: h (left), j (down), k (up), l (right)\n" +
                            "- Mode switching: i (insert mode), v (visual mode), ESC (normal mode)\n" +
-                           "- Special abilities: x (delete), w (word forward), b (word backward)\n\n" +
+                           "- Special abilities: x (delete), w (word forward), b (word backward)\n" +
+                           "- Jumps: 0/$ (row start/end), gg/G (top/bottom), e (word end)\n" +
+                           "- Counts: prefix a number to repeat, e.g. 5l or 3w\n" +
+                           "- Undo/redo: u and Ctrl-R\n\n" +
                            "Follow the instructions in each level to master the mystical arts of text manipulation!")
\ No newline at end of file
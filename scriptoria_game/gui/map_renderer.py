@@ -0,0 +1,147 @@
+import tkinter as tk
+import warnings
+from constants import FONT_TYPES
+from gui.fonts import get_font
+
+try:
+    from PIL import Image, ImageDraw, ImageFont, ImageTk
+except ImportError:  # Pillow is optional; only the atlas renderer needs it
+    Image = None
+
+# Monospace bold fonts tried in order when rasterizing the glyph atlas
+ATLAS_FONT_FILES = ["DejaVuSansMono-Bold.ttf", "courbd.ttf", "Courier New Bold.ttf", "LiberationMono-Bold.ttf"]
+
+class TextRenderer:
+    """Draws map cells as canvas text items (walls as rectangles), one item per screen slot"""
+    def __init__(self, canvas, cell_width, cell_height):
+        self.canvas = canvas
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.font = get_font(canvas, "map")
+        # (row, col) on screen -> (item id, kind)
+        self.items = {}
+
+    def draw(self, slot, cell, color):
+        """Show cell in the given color at a screen slot, reusing its item when possible"""
+        # Walls are drawn as rectangles, everything else as text
+        kind = "wall" if cell == '#' else "text"
+        item = self.items.get(slot)
+        if item is not None and item[1] != kind:
+            self.canvas.delete(item[0])
+            item = None
+
+        if item is None:
+            x1 = slot[1] * self.cell_width
+            y1 = slot[0] * self.cell_height
+            if kind == "wall":
+                item_id = self.canvas.create_rectangle(
+                    x1, y1, x1 + self.cell_width, y1 + self.cell_height, fill=color, outline=""
+                )
+            else:
+                item_id = self.canvas.create_text(
+                    x1 + self.cell_width/2,
+                    y1 + self.cell_height/2,
+                    text=cell.strip(),
+                    fill=color,
+                    font=self.font
+                )
+            self.items[slot] = (item_id, kind)
+        elif kind == "wall":
+            self.canvas.itemconfig(item[0], fill=color)
+        else:
+            self.canvas.itemconfig(item[0], text=cell.strip(), fill=color)
+
+    def drop(self, slot):
+        """Delete the item of a screen slot"""
+        item = self.items.pop(slot, None)
+        if item is not None:
+            self.canvas.delete(item[0])
+
+    def clear(self):
+        """Delete every item"""
+        self.canvas.delete("all")
+        self.items = {}
+
+class GlyphAtlas:
+    """(character, color) glyphs rasterized once into PhotoImages and shared by all cells"""
+    def __init__(self, canvas, cell_width, cell_height):
+        self.canvas = canvas
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        family, size, weight = FONT_TYPES["map"]
+        pixel_size = round(size * canvas.winfo_fpixels("1i") / 72)
+        self.font = None
+        for font_file in ATLAS_FONT_FILES:
+            try:
+                self.font = ImageFont.truetype(font_file, pixel_size)
+                break
+            except OSError:
+                continue
+        if self.font is None:
+            self.font = ImageFont.load_default()
+        self.images = {}
+
+    def get(self, cell, color):
+        """Get the image for cell drawn in color, rasterizing it on first use"""
+        image = self.images.get((cell, color))
+        if image is None:
+            size = (self.cell_width, self.cell_height)
+            if cell == '#':
+                glyph = Image.new("RGBA", size, color)
+            else:
+                glyph = Image.new("RGBA", size, (0, 0, 0, 0))
+                if cell != ' ':
+                    ImageDraw.Draw(glyph).text(
+                        (self.cell_width / 2, self.cell_height / 2), cell,
+                        fill=color, font=self.font, anchor="mm"
+                    )
+            image = ImageTk.PhotoImage(glyph, master=self.canvas)
+            self.images[(cell, color)] = image
+        return image
+
+    def __len__(self):
+        return len(self.images)
+
+class AtlasRenderer:
+    """Draws map cells as image items that point into a shared GlyphAtlas"""
+    def __init__(self, canvas, cell_width, cell_height):
+        self.canvas = canvas
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.atlas = GlyphAtlas(canvas, cell_width, cell_height)
+        # (row, col) on screen -> image item id
+        self.items = {}
+
+    def draw(self, slot, cell, color):
+        """Show cell in the given color at a screen slot, reusing its item when possible"""
+        image = self.atlas.get(cell, color)
+        item = self.items.get(slot)
+        if item is None:
+            self.items[slot] = self.canvas.create_image(
+                slot[1] * self.cell_width, slot[0] * self.cell_height, image=image, anchor=tk.NW
+            )
+        else:
+            self.canvas.itemconfig(item, image=image)
+
+    def drop(self, slot):
+        """Delete the item of a screen slot"""
+        item = self.items.pop(slot, None)
+        if item is not None:
+            self.canvas.delete(item)
+
+    def clear(self):
+        """Delete every item (the atlas itself is kept)"""
+        self.canvas.delete("all")
+        self.items = {}
+
+RENDERERS = {
+    "text": TextRenderer,
+    "atlas": AtlasRenderer,
+}
+
+def create_renderer(name, canvas, cell_width, cell_height):
+    """Create the map renderer called name, falling back to text when Pillow is missing"""
+    if name == "atlas" and Image is None:
+        warnings.warn("The atlas renderer needs Pillow; falling back to the text renderer", stacklevel=2)
+        name = "text"
+    return RENDERERS[name](canvas, cell_width, cell_height)
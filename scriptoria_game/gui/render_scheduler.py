@@ -0,0 +1,37 @@
+import time
+
+class RenderScheduler:
+    """Coalesces paint requests so the screen is painted at most once per idle cycle
+
+    Input handlers call request() after every key; the actual paint runs from
+    after_idle (or after, when a target frame rate is set) so a burst of
+    autorepeat events results in a single frame.
+    """
+    def __init__(self, root, paint, target_fps=None):
+        self.root = root
+        self.paint = paint
+        self.frame_interval = 1.0 / target_fps if target_fps else 0.0
+        self.last_paint = 0.0
+        self.after_id = None
+
+    def request(self):
+        """Mark the view dirty and schedule a paint if none is pending"""
+        if self.after_id is not None:
+            return
+        delay = self.last_paint + self.frame_interval - time.perf_counter()
+        if delay > 0:
+            self.after_id = self.root.after(int(delay * 1000) + 1, self.run)
+        else:
+            self.after_id = self.root.after_idle(self.run)
+
+    def run(self):
+        """Paint now and clear the pending request"""
+        self.after_id = None
+        self.last_paint = time.perf_counter()
+        self.paint()
+
+    def cancel(self):
+        """Drop a pending paint, e.g. when the screen is rebuilt from scratch"""
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
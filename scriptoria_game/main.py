@@ -1,16 +1,24 @@
 # FILE: main.py
+import argparse
+import random
 import tkinter as tk
 import tkinter.font
 from constants import GameState, Mode
-from models.player import Player
+from game.latency import LatencyStats
 from game.level_manager import LevelManager
-from game.game_logic import GameLogic
+from game.profiler import Profiler
+from game.save_store import SaveStore, DEFAULT_SAVE_PATH
+from game.session import GameSession, ESCAPE
 from gui.main_menu import MainMenu
 from gui.level_select import LevelSelect
 from gui.game_screen import GameScreen
+from gui.render_scheduler import RenderScheduler
+from gui.map_renderer import RENDERERS
 
 class GameManager:
-    def __init__(self, root):
+    def __init__(self, root, target_fps=None, message_history=None, renderer="text", level_manager=None,
+                 endless_seed=None, store=None, latency=False, latency_csv=None,
+                 profiler=None):
         self.root = root
         self.game_state = GameState.MAIN_MENU
         
@@ -20,19 +28,29 @@ class GameManager:
         self.root.configure(bg="black")
         self.root.resizable(False, False)
         
-        # Initialize game components
-        self.level_manager = LevelManager()
-        self.game_logic = GameLogic(self.level_manager)
-        self.player = Player()
+        # Game state lives in a headless session; this class only adapts it to Tk
+        self.session = GameSession(level_manager, endless_seed, store)
+        self.level_manager = self.session.level_manager
+        self.game_logic = self.session.game_logic
+        self.player = self.session.player
         
-        # Initialize screens
-        self.main_menu = MainMenu(self.root, self)
-        self.level_select = LevelSelect(self.root, self)
-        self.game_screen = GameScreen(self.root, self)
+        # Screens are built the first time they are shown
+        self.screen_factories = {
+            "main_menu": lambda: MainMenu(self.root, self),
+            "level_select": lambda: LevelSelect(self.root, self),
+            "game": lambda: GameScreen(self.root, self, spill_path=message_history, renderer=renderer),
+        }
+        self.screens = {}
         
-        # Game map data
-        self.game_map = []
-        self.original_map = []
+        # Paints are coalesced: key handlers only mark the map dirty
+        self.render_scheduler = RenderScheduler(self.root, self.paint_game, target_fps)
+        
+        # Key-to-paint latency, only measured when asked for (or exported)
+        self.latency = LatencyStats() if latency or latency_csv else None
+        self.latency_csv = latency_csv
+        
+        # Optional cProfile around key dispatch and map updates
+        self.profiler = profiler
         
         # Show main menu
         self.show_main_menu()
@@ -40,14 +58,44 @@ class GameManager:
         # Set up key bindings
         self.root.bind('<Key>', self.handle_keypress)
         self.root.bind('<Escape>', self.handle_escape)
+        if self.latency is not None:
+            self.root.bind('<F3>', self.toggle_latency_overlay)
+        if self.profiler is not None:
+            self.root.bind('<F4>', self.toggle_profiling)
+        
+    def screen(self, name):
+        """A screen by name, built on first use"""
+        screen = self.screens.get(name)
+        if screen is None:
+            screen = self.screens[name] = self.screen_factories[name]()
+        return screen
+    
+    @property
+    def main_menu(self):
+        """The main menu screen"""
+        return self.screen("main_menu")
+    
+    @property
+    def level_select(self):
+        """The level select screen"""
+        return self.screen("level_select")
+    
+    @property
+    def game_screen(self):
+        """The screen a level is played on"""
+        return self.screen("game")
+    
+    def hide_screens(self):
+        """Hide every screen built so far"""
+        for screen in self.screens.values():
+            screen.hide()
         
     def show_main_menu(self):
         """Show the main menu screen"""
         self.game_state = GameState.MAIN_MENU
         
         # Hide all screens
-        self.level_select.hide()
-        self.game_screen.hide()
+        self.hide_screens()
         
         # Show main menu
         self.main_menu.show()
@@ -57,8 +105,7 @@ class GameManager:
         self.game_state = GameState.LEVEL_SELECT
         
         # Hide all screens
-        self.main_menu.hide()
-        self.game_screen.hide()
+        self.hide_screens()
         
         # Show level select
         self.level_select.show()
@@ -68,33 +115,39 @@ class GameManager:
         self.game_state = GameState.PLAYING
         
         # Hide all screens
-        self.main_menu.hide()
-        self.level_select.hide()
+        self.hide_screens()
         
-        # Reset player for new level
-        self.player.reset_for_level(level_index)
-        
-        # Create game map
-        self.game_map, self.original_map, player_position = self.level_manager.create_map(level_index)
-        self.player.position = player_position
+        # Reset player and create the game map
+        self.session.start_level(level_index)
         
         # Show game screen
         self.game_screen.show()
         
         # Clear messages and add welcome message
-        self.game_screen.messages = []
-        self.game_screen.add_message(f"Starting level {level_index + 1}: {self.level_manager.get_level(level_index).name}")
+        self.game_screen.clear_messages()
+        self.show_messages()
         self.game_screen.add_message("Press 'p' to pause the game")
         
-        # Update the display
-        self.game_screen.update_display(self.player, self.player.current_level, self.game_map, self.original_map)
+        # Update the display (full redraw for the new map)
+        self.render_scheduler.cancel()
+        self.profiled(self.game_screen.update_display, self.player, self.player.current_level,
+                      self.session.grid)
         
         # Focus for keyboard input
         self.game_screen.canvas.focus_set()
     
     def handle_keypress(self, event):
         """Handle keyboard input based on game state"""
+        if self.latency is not None:
+            self.latency.receive()
+        self.profiled(self.dispatch_keypress, event)
+    
+    def dispatch_keypress(self, event):
+        """Route a key to the controls of the current game state"""
         key = event.char
+        if not key:
+            # Modifier keys (Shift, Control) have no character; they must not reach a pending count
+            return
         
         # Main menu controls
         if self.game_state == GameState.MAIN_MENU:
@@ -117,21 +170,12 @@ class GameManager:
                 
     def handle_escape(self, event):
         """Handle the Escape key separately"""
+        if self.latency is not None:
+            self.latency.receive()
         if self.game_state == GameState.PLAYING:
-            # Check if we need to exit insert mode first
-            if self.player.mode == Mode.INSERT:
-                self.player.mode = Mode.NORMAL
-                self.game_screen.add_message("Switched to normal mode")
-                
-                # For level 1, check if "wizard" was typed when exiting insert mode
-                if self.player.current_level == 1:
-                    map_text = self.game_map[4]
-                    typed_text = ''.join(map_text[3:9])
-                    if typed_text == "wizard":
-                        self.game_screen.add_message("You typed the magic word!")
-                        self.complete_level()
-                
-                self.game_screen.update_display(self.player, self.player.current_level, self.game_map, self.original_map)
+            # Check if we need to exit insert/visual mode first
+            if self.player.mode != Mode.NORMAL:
+                self.step(ESCAPE)
             else:
                 # Show pause menu or return to main menu
                 self.show_main_menu()
@@ -140,73 +184,69 @@ class GameManager:
     
     def handle_game_input(self, key):
         """Process input during gameplay"""
-        current_level = self.player.current_level
-        level_completed = False
-        message = None
-        
-        # Mode switching
-        if self.player.mode == Mode.NORMAL and key == 'i':
-            self.player.mode = Mode.INSERT
-            message = "Switched to insert mode"
-        elif self.player.mode == Mode.NORMAL and key == 'v':
-            self.player.mode = Mode.VISUAL
-            message = "Switched to visual mode"
-        else:
-            # Handle input based on current mode
-            if self.player.mode == Mode.NORMAL:
-                self.game_map, self.original_map, self.player.position, level_completed, mode_message = \
-                    self.game_logic.handle_normal_mode(key, self.game_map, self.original_map, 
-                                                      self.player.position, self.player.current_level)
-                if mode_message:
-                    message = mode_message
-                    
-            elif self.player.mode == Mode.INSERT:
-                self.game_map, self.original_map, self.player.position, level_completed, mode_message = \
-                    self.game_logic.handle_insert_mode(key, self.game_map, self.original_map, 
-                                                     self.player.position, self.player.current_level)
-                if mode_message:
-                    message = mode_message
-                    
-            elif self.player.mode == Mode.VISUAL:
-                self.game_map, self.original_map, self.player.position, mode_message = \
-                    self.game_logic.handle_visual_mode(key, self.game_map, self.original_map, 
-                                                     self.player.position)
-                if mode_message:
-                    message = mode_message
-            
-            # Handle game pause
-            if key == 'p' or key == 'P':
-                message = "Game paused"
-                self.game_state = GameState.PAUSED
-                self.show_main_menu()
-                
-        # Add message if there is one
-        if message:
-            self.game_screen.add_message(message)
-            
-        # Update display
-        self.game_screen.update_display(self.player, self.player.current_level, self.game_map, self.original_map)
+        self.step(key)
+        
+        # Handle game pause
+        if (key == 'p' or key == 'P') and self.game_state == GameState.PLAYING:
+            self.game_screen.add_message("Game paused")
+            self.game_state = GameState.PAUSED
+            self.show_main_menu()
+    
+    def step(self, key):
+        """Feed a key to the session and show what it produced"""
+        level_completed = self.session.step(key)
+        if self.latency is not None:
+            self.latency.handled(key)
+        self.show_messages()
+        
+        # Schedule a repaint; several keys in one burst share a single frame
+        self.render_scheduler.request()
         
         # Check if level is completed
         if level_completed:
             self.complete_level()
     
+    def show_messages(self):
+        """Move the session's new messages into the message area"""
+        for message in self.session.take_messages():
+            self.game_screen.add_message(message)
+    
+    def paint_game(self):
+        """Paint the cells changed since the last frame"""
+        self.profiled(self.game_screen.update_display, self.player, self.player.current_level,
+                      self.session.grid, self.session.take_changed_cells())
+        if self.latency is not None:
+            self.latency.painted()
+            self.game_screen.update_latency_overlay(self.latency)
+    
+    def profiled(self, func, *args):
+        """Call func, under the profiler while profiling is on"""
+        if self.profiler is not None and self.profiler.active:
+            return self.profiler.call(func, *args)
+        return func(*args)
+    
+    def toggle_profiling(self, event):
+        """Start or stop profiling key handling and painting (F4)"""
+        state = "on" if self.profiler.toggle() else "off"
+        if "game" in self.screens:
+            self.game_screen.add_message(f"Profiling {state}")
+    
+    def toggle_latency_overlay(self, event):
+        """Show or hide the latency numbers over the map (F3)"""
+        if "game" not in self.screens:
+            # No map yet; do not build the game screen just for its overlay
+            return
+        self.game_screen.toggle_latency_overlay()
+        self.game_screen.update_latency_overlay(self.latency)
+    
     def complete_level(self):
         """Handle level completion"""
         current_level = self.player.current_level
         
-        # Mark level as completed
-        level = self.level_manager.get_level(current_level)
-        level.mark_completed()
-        
-        # Update score
-        self.player.score += 100
-        
-        # Show completion message
-        self.game_screen.add_message(f"Level {current_level + 1} completed! +100 points")
+        # The session already marked the level completed and updated the score
         
         # Check if there are more levels
-        if current_level + 1 < len(self.level_manager.get_all_levels()):
+        if self.session.has_next_level():
             # Ask if player wants to continue to next level
             self.game_screen.add_message("Press 'n' for next level or 'm' for menu")
             
@@ -235,12 +275,70 @@ class GameManager:
     def quit_game(self):
         """Exit the game"""
         self.root.quit()
+    
+    def close(self):
+        """Close the message history and the session, then report latency and profile results"""
+        if "game" in self.screens:
+            self.game_screen.messages.close()
+        self.session.close()
+        if self.latency is not None:
+            print("Key-to-paint latency:")
+            print("\n".join(self.latency.summary()))
+            if self.latency_csv:
+                self.latency.export_csv(self.latency_csv)
+        if self.profiler is not None:
+            summary = self.profiler.close()
+            if summary is not None:
+                print(f"Profile written to {self.profiler.path}")
+                print(summary)
 
 def main():
     """Main entry point for the game"""
+    parser = argparse.ArgumentParser(description="Scriptoria: The Text Wizard's Journey")
+    parser.add_argument("--fps", type=int, default=None,
+                        help="cap the map repaint rate (default: repaint once per idle cycle)")
+    parser.add_argument("--message-history", metavar="PATH", default=None,
+                        help="append messages that scroll out of the log to this file")
+    parser.add_argument("--renderer", choices=sorted(RENDERERS), default="text",
+                        help="draw map cells as canvas text or as pre-rendered glyph images (needs Pillow)")
+    parser.add_argument("--pack", metavar="PATH", default=None,
+                        help="play the levels of this level pack file instead of the built-in ones")
+    parser.add_argument("--endless", action="store_true",
+                        help="follow the last level with an endless stream of generated practice levels")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed for the generated levels (default: a new one every run)")
+    parser.add_argument("--save", metavar="PATH", default=DEFAULT_SAVE_PATH,
+                        help="keep progress in PATH.json and PATH.journal (default: %(default)s)")
+    parser.add_argument("--no-save", action="store_true",
+                        help="do not load or save progress")
+    parser.add_argument("--latency", action="store_true",
+                        help="measure key-to-paint latency; F3 shows it over the map")
+    parser.add_argument("--latency-csv", metavar="PATH", default=None,
+                        help="measure latency and write every key's timings to this CSV file on exit")
+    parser.add_argument("--profile", action="store_true",
+                        help="profile key handling and painting from the start (F4 toggles it at any time)")
+    parser.add_argument("--profile-output", metavar="PATH", default=None,
+                        help="where to write the .pstats file (default: scriptoria-<date>-<time>.pstats)")
+    args = parser.parse_args()
+    endless_seed = None
+    if args.endless:
+        endless_seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+    try:
+        level_manager = LevelManager(args.pack)
+    except ValueError as error:
+        # A pack whose maps cannot be stored
+        parser.error(str(error))
+    store = None if args.no_save else SaveStore(args.save)
+    profiler = Profiler(args.profile_output)
+    if args.profile:
+        profiler.toggle()
+    
     root = tk.Tk()
-    game = GameManager(root)
+    game = GameManager(root, target_fps=args.fps, message_history=args.message_history,
+                       renderer=args.renderer, level_manager=level_manager, endless_seed=endless_seed, store=store,
+                       latency=args.latency, latency_csv=args.latency_csv, profiler=profiler)
     root.mainloop()
+    game.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
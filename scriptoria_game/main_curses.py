@@ -0,0 +1,41 @@
+# FILE: main_curses.py
+# Terminal entry point: runs over SSH without a display server and never imports tkinter
+import argparse
+import random
+from game.level_manager import LevelManager
+from game.save_store import SaveStore, DEFAULT_SAVE_PATH
+from game.session import GameSession
+from tui.curses_app import run
+
+def main():
+    """Main entry point for the terminal game"""
+    parser = argparse.ArgumentParser(description="Scriptoria in the terminal")
+    parser.add_argument("--pack", metavar="PATH", default=None,
+                        help="play the levels of this level pack file instead of the built-in ones")
+    parser.add_argument("--endless", action="store_true",
+                        help="follow the last level with an endless stream of generated practice levels")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed for the generated levels (default: a new one every run)")
+    parser.add_argument("--save", metavar="PATH", default=DEFAULT_SAVE_PATH,
+                        help="keep progress in PATH.json and PATH.journal (default: %(default)s)")
+    parser.add_argument("--no-save", action="store_true",
+                        help="do not load or save progress")
+    args = parser.parse_args()
+    endless_seed = None
+    if args.endless:
+        endless_seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+    try:
+        level_manager = LevelManager(args.pack)
+    except ValueError as error:
+        # A pack whose maps cannot be stored
+        parser.error(str(error))
+    store = None if args.no_save else SaveStore(args.save)
+    
+    session = GameSession(level_manager, endless_seed, store)
+    try:
+        run(session)
+    finally:
+        session.close()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
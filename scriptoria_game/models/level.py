@@ -1,11 +1,27 @@
 class Level:
-    def __init__(self, name, description, goal, tutorial):
+    def __init__(self, name, description, goal, tutorial, map_rows=None, goals=("portal",), target_word=None,
+                 map_loader=None, cells_loader=None, target_at=None):
         self.name = name
         self.description = description
         self.goal = goal
         self.tutorial = tutorial
+        self._map_rows = map_rows  # Map template as a list of strings, 'P' marks the start
+        self.map_loader = map_loader  # Reads the map rows on demand when they are not given
+        self.cells_loader = cells_loader  # Returns (height, width, cells buffer) from a compiled pack
+        self.goals = tuple(goals)  # All must be met: "portal", "runes", "gems", "word"
+        self.target_word = target_word  # Word to type for the "word" goal
+        self.target_at = target_at  # (y, x) where the target word must start, or None for anywhere
         self.completed = False
         
+    @property
+    def map_rows(self):
+        """Map template rows, read through map_loader each time if they live in a pack"""
+        if self._map_rows is not None:
+            return self._map_rows
+        if self.map_loader is not None:
+            return self.map_loader()
+        return []
+        
     def mark_completed(self):
         """Mark this level as completed"""
         self.completed = True
@@ -0,0 +1,38 @@
+# FILE: solve_levels.py
+# Finds the shortest key sequence (par) for every level and flags levels that cannot be solved
+import argparse
+import os
+import sys
+from game.level_manager import LevelManager
+from game.solver import SolutionCache, solve_levels, format_keys
+
+DEFAULT_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "solutions_cache.json")
+
+def main():
+    """Solve all levels and print their par scores"""
+    parser = argparse.ArgumentParser(description="Find the par keystroke count of every level")
+    parser.add_argument("--cache", metavar="PATH", default=DEFAULT_CACHE,
+                        help="solution cache file, keyed by a hash of each level's content")
+    parser.add_argument("--no-cache", action="store_true", help="solve every level again")
+    parser.add_argument("--max-states", type=int, default=200000,
+                        help="give up on a level after exploring this many states")
+    parser.add_argument("--pack", metavar="PATH", default=None,
+                        help="level pack file (default: the built-in levels)")
+    args = parser.parse_args()
+    
+    cache = None if args.no_cache else SolutionCache(args.cache)
+    levels = LevelManager(args.pack).get_all_levels()
+    unsolved = 0
+    for i, (level, keys, states, cached) in enumerate(solve_levels(levels, cache, args.max_states)):
+        source = "cached" if cached else f"{states} states"
+        if keys is None:
+            unsolved += 1
+            print(f"{i + 1}. {level.name}: NO SOLUTION ({source})")
+        else:
+            print(f"{i + 1}. {level.name}: par {len(keys)} - {format_keys(keys)} ({source})")
+    if cache is not None:
+        cache.save()
+    return 1 if unsolved else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
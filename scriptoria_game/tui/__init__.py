@@ -0,0 +1,2 @@
+# Terminal (curses) frontend; importing it never pulls in tkinter
+from tui.curses_app import CursesGame, run
\ No newline at end of file
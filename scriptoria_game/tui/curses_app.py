@@ -0,0 +1,222 @@
+import curses
+import locale
+import os
+from constants import GameState, Mode, TileClass, MESSAGE_LOG_SIZE, VISIBLE_MESSAGES, VIEW_MARGIN
+from game.session import GameSession, ESCAPE as ESCAPE_KEY
+from game.message_log import MessageLog
+from game.viewport import scroll_start
+
+ESCAPE = 27
+
+# Curses color for each tile class (the player is drawn in green)
+TILE_CURSES_COLORS = {
+    TileClass.EMPTY: curses.COLOR_WHITE,
+    TileClass.WALL: curses.COLOR_WHITE,
+    TileClass.PORTAL: curses.COLOR_BLUE,
+    TileClass.RUNE: curses.COLOR_RED,
+    TileClass.WORD: curses.COLOR_YELLOW,
+    TileClass.GEM: curses.COLOR_MAGENTA,
+    TileClass.TEXT: curses.COLOR_WHITE,
+}
+
+# Screen rows above the map and below it
+HEADER_ROWS = 3
+FOOTER_ROWS = 2 + VISIBLE_MESSAGES
+
+class CursesGame:
+    """Terminal frontend over the same headless GameSession as the Tk GUI
+
+    Only cells reported by GameLogic are rewritten; curses' refresh then sends
+    just the differences to the terminal.
+    """
+    def __init__(self, stdscr, session=None):
+        self.stdscr = stdscr
+        self.game_state = GameState.LEVEL_SELECT
+        self.session = session if session is not None else GameSession()
+        self.level_manager = self.session.level_manager
+        self.game_logic = self.session.game_logic
+        self.player = self.session.player
+        self.messages = MessageLog(MESSAGE_LOG_SIZE)
+        self.running = True
+        # Viewport over the map
+        self.view_top = 0
+        self.view_left = 0
+        self.full_redraw = True
+        # Last text written to each status line, to skip unchanged ones
+        self.status_lines = {}
+
+        curses.curs_set(0)
+        self.stdscr.keypad(True)
+        if curses.has_colors():
+            curses.start_color()
+            curses.use_default_colors()
+            colors = set(TILE_CURSES_COLORS.values()) | {curses.COLOR_GREEN, curses.COLOR_CYAN}
+            for color in colors:
+                curses.init_pair(color + 1, color, -1)
+
+    def attr(self, color, bold=False):
+        """Curses attribute for a foreground color"""
+        attr = curses.color_pair(color + 1) if curses.has_colors() else 0
+        return attr | curses.A_BOLD if bold else attr
+
+    def run(self):
+        """Main loop: block for a key, drain any queued repeats, then paint once"""
+        self.paint()
+        while self.running:
+            key = self.stdscr.getch()
+            self.stdscr.nodelay(True)
+            while key != -1 and self.running:
+                self.handle_key(key)
+                key = self.stdscr.getch()
+            self.stdscr.nodelay(False)
+            if self.running:
+                self.paint()
+
+    def handle_key(self, key):
+        """Dispatch a key code based on game state"""
+        if key == curses.KEY_RESIZE:
+            self.full_redraw = True
+            return
+        char = chr(key) if 0 <= key < 256 else ''
+
+        if self.game_state == GameState.LEVEL_SELECT:
+            levels = self.level_manager.get_all_levels()
+            if char in ('q', 'Q') or key == ESCAPE:
+                self.running = False
+            elif char.isdigit() and 1 <= int(char) <= len(levels):
+                level_idx = int(char) - 1
+                if level_idx == 0 or levels[level_idx - 1].is_completed():
+                    self.start_level(level_idx)
+        elif self.session.level_completed:
+            if not self.session.has_next_level():
+                # Last level: any key returns to the menu
+                self.show_level_select()
+            elif char == 'n':
+                self.start_level(self.player.current_level + 1)
+            elif char == 'm' or key == ESCAPE:
+                self.show_level_select()
+        elif self.game_state == GameState.PLAYING:
+            if key == ESCAPE and self.player.mode == Mode.NORMAL:
+                self.show_level_select()
+            elif key == ESCAPE:
+                self.step(ESCAPE_KEY)
+            elif char:
+                self.step(char)
+
+    def show_level_select(self):
+        """Switch to the level list"""
+        self.game_state = GameState.LEVEL_SELECT
+        self.full_redraw = True
+
+    def start_level(self, level_index):
+        """Start a specific level"""
+        self.game_state = GameState.PLAYING
+        self.messages.clear()
+        self.session.start_level(level_index)
+        self.show_messages()
+        self.view_top = 0
+        self.view_left = 0
+        self.full_redraw = True
+
+    def step(self, key):
+        """Feed a key to the session and log what it produced"""
+        if self.session.step(key):
+            if self.session.has_next_level():
+                self.session.messages.append("Press 'n' for next level or 'm' for menu")
+            else:
+                self.session.messages.append("Congratulations! You've completed all levels! Press any key")
+        self.show_messages()
+
+    def show_messages(self):
+        """Move the session's new messages into the log"""
+        for message in self.session.take_messages():
+            self.messages.append(message)
+
+    def paint(self):
+        """Write the changed parts of the screen and let curses diff them out"""
+        if self.full_redraw:
+            self.stdscr.erase()
+            self.status_lines = {}
+        if self.game_state == GameState.LEVEL_SELECT:
+            self.paint_level_select()
+        else:
+            self.paint_game()
+        self.full_redraw = False
+        self.stdscr.refresh()
+
+    def put_line(self, y, text, attr=0):
+        """Write a status line if its text changed"""
+        height, width = self.stdscr.getmaxyx()
+        if y >= height or self.status_lines.get(y) == (text, attr):
+            return
+        self.status_lines[y] = (text, attr)
+        self.stdscr.move(y, 0)
+        self.stdscr.clrtoeol()
+        self.stdscr.addnstr(y, 0, text, width - 1, attr)
+
+    def paint_level_select(self):
+        """Draw the level list"""
+        self.put_line(0, "SCRIPTORIA - SELECT LEVEL", self.attr(curses.COLOR_GREEN, bold=True))
+        levels = self.level_manager.get_all_levels()
+        for i, level in enumerate(levels):
+            status = "✓ " if level.is_completed() else "  "
+            locked = "" if i == 0 or levels[i - 1].is_completed() else " (locked)"
+            self.put_line(2 + i, f"{status}{i + 1}: {level.name}{locked}")
+        self.put_line(3 + len(levels), "Press a level number to play, q to quit", self.attr(curses.COLOR_CYAN))
+
+    def paint_game(self):
+        """Draw the status lines and the changed map cells"""
+        level = self.level_manager.get_level(self.player.current_level)
+        height, width = self.stdscr.getmaxyx()
+        view_rows = max(1, height - HEADER_ROWS - FOOTER_ROWS)
+        view_cols = max(1, width - 1)
+
+        self.put_line(0, f"Level: {level.name}", self.attr(curses.COLOR_GREEN, bold=True))
+        self.put_line(1, f"Goal: {level.goal}")
+        mode_help = self.game_logic.mode_help[self.player.mode]
+        self.put_line(HEADER_ROWS + view_rows, f"Mode: {self.player.mode.name} - {mode_help}",
+                      self.attr(curses.COLOR_YELLOW))
+        recent = self.messages.recent(VISIBLE_MESSAGES)
+        for i in range(VISIBLE_MESSAGES):
+            self.put_line(HEADER_ROWS + view_rows + 1 + i, recent[i] if i < len(recent) else "")
+        self.put_line(HEADER_ROWS + view_rows + 1 + VISIBLE_MESSAGES, f"Hint: {level.tutorial}",
+                      self.attr(curses.COLOR_CYAN))
+
+        # Follow the player; a scroll rewrites the whole (bounded) view
+        grid = self.session.grid
+        y, x = self.player.position
+        top = scroll_start(self.view_top, y, view_rows, grid.height, VIEW_MARGIN)
+        left = scroll_start(self.view_left, x, view_cols, grid.width, VIEW_MARGIN)
+        changed = self.session.take_changed_cells()
+        if self.full_redraw or (top, left) != (self.view_top, self.view_left):
+            self.view_top = top
+            self.view_left = left
+            changed = [(cy, cx) for cy in range(top, min(top + view_rows, grid.height))
+                       for cx in range(left, min(left + view_cols, grid.width))]
+            for row in range(HEADER_ROWS, HEADER_ROWS + view_rows):
+                self.stdscr.move(row, 0)
+                self.stdscr.clrtoeol()
+
+        for cy, cx in changed:
+            if top <= cy < top + view_rows and left <= cx < left + view_cols:
+                self.draw_cell(cy, cx, HEADER_ROWS + cy - top, cx - left)
+
+    def draw_cell(self, y, x, screen_y, screen_x):
+        """Write one map cell"""
+        grid = self.session.grid
+        cell = grid.get(y, x)
+        if cell == 'P':
+            attr = self.attr(curses.COLOR_GREEN, bold=True)
+        else:
+            tile = grid.tile(y, x)
+            attr = self.attr(TILE_CURSES_COLORS[tile], bold=tile is not TileClass.WALL)
+            if tile is TileClass.WALL:
+                attr |= curses.A_REVERSE
+        self.stdscr.addstr(screen_y, screen_x, cell, attr)
+
+def run(session=None):
+    """Start the curses frontend"""
+    locale.setlocale(locale.LC_ALL, "")
+    # Make a lone ESC register quickly instead of waiting for an escape sequence
+    os.environ.setdefault("ESCDELAY", "25")
+    curses.wrapper(lambda stdscr: CursesGame(stdscr, session).run())